@@ -1,5 +1,130 @@
-def find_max(arr):
-    """Возвращает максимальный элемент массива."""
+import array
+import bisect
+import concurrent.futures
+import functools
+import heapq
+import itertools
+import math
+import os
+import pickle
+import sqlite3
+import tempfile
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен: без него работают встроенные редукции
+    np = None
+
+
+def _is_vector(arr):
+    """Проверяет, что вход — numpy.ndarray, array.array или memoryview."""
+    if np is not None and isinstance(arr, np.ndarray):
+        return True
+    return isinstance(arr, (array.array, memoryview))
+
+
+def _vector_size(arr):
+    """Количество элементов векторного входа."""
+    if np is not None and isinstance(arr, np.ndarray):
+        return arr.size
+    return len(arr)
+
+
+def _is_empty(arr):
+    """Проверка на пустоту, работающая и для numpy.ndarray."""
+    if _is_vector(arr):
+        return _vector_size(arr) == 0
+    return not arr
+
+
+# === Компактное типизированное хранение (array.array) ===
+
+def make_typed_array(values, typecode=None):
+    """
+    Упаковывает числа в array.array: 8 байт на элемент вместо 28+ байт
+    у объектов int/float в списке (плюс 8 байт на ссылку).
+    :param typecode: код типа array.array; по умолчанию "q" для целых и "d" для остальных
+    """
+    if typecode is None:
+        values = list(values)
+        typecode = "q" if all(isinstance(v, int) for v in values) else "d"
+    return array.array(typecode, values)
+
+
+def _working_copy(arr):
+    """Изменяемая копия для сортировки в том же компактном формате, что и вход."""
+    if isinstance(arr, array.array):
+        return array.array(arr.typecode, arr)
+    if isinstance(arr, memoryview):
+        return array.array(arr.format, arr)
+    if np is not None and isinstance(arr, np.ndarray):
+        return arr.copy()
+    return list(arr)
+
+
+def _collect_like(arr, values):
+    """
+    Собирает итерируемый values в контейнер того же типа, что и arr.
+    Для array.array и memoryview элементы сразу пишутся в array.array,
+    без промежуточного списка объектов float/int.
+    """
+    if isinstance(arr, array.array):
+        return array.array(arr.typecode, values)
+    if isinstance(arr, memoryview):
+        return array.array(arr.format, values)
+    return _wrap_like(arr, list(values))
+
+
+def _wrap_like(arr, values):
+    """Возвращает values в контейнере того же типа, что и arr (для списков — как есть)."""
+    if isinstance(arr, array.array):
+        return values if isinstance(values, array.array) else array.array(arr.typecode, values)
+    if isinstance(arr, memoryview):
+        return values if isinstance(values, array.array) else array.array(arr.format, values)
+    if np is not None and isinstance(arr, np.ndarray):
+        return np.asarray(values, dtype=arr.dtype)
+    return values
+
+
+# === Параллельная обработка (пул процессов) ===
+
+# Меньшие массивы обрабатываются в одном процессе: запуск пула дороже самой работы
+PARALLEL_MIN_SIZE = 10_000
+
+
+def _use_parallel(arr, parallel):
+    return parallel and not _is_empty(arr) and len(arr) >= PARALLEL_MIN_SIZE
+
+
+def _map_shards(func, arr, workers=None):
+    """
+    Делит массив на непрерывные части по числу процессов
+    и применяет func к каждой части в ProcessPoolExecutor.
+    """
+    workers = workers or os.cpu_count() or 1
+    if isinstance(arr, memoryview):
+        arr = _working_copy(arr)  # memoryview не сериализуется для передачи в процесс
+    step = math.ceil(len(arr) / workers)
+    shards = [arr[i:i + step] for i in range(0, len(arr), step)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=len(shards)) as pool:
+        return list(pool.map(func, shards))
+
+
+def find_max(arr, parallel=False, workers=None):
+    """
+    Возвращает максимальный элемент массива.
+    При parallel=True большие массивы делятся между workers процессами
+    (по умолчанию — по числу ядер), максимумы частей сводятся в один.
+    """
+    if _use_parallel(arr, parallel):
+        return max(_map_shards(find_max, arr, workers))
+    if _is_vector(arr):
+        if _vector_size(arr) == 0:
+            raise ValueError("Массив пуст")
+        if np is not None:
+            # np.asarray не копирует буфер array.array / memoryview
+            return np.asarray(arr).max().item()
+        return max(arr)
     if not arr:
         raise ValueError("Массив пуст")
     max_val = arr[0]
@@ -9,6 +134,41 @@ def find_max(arr):
     return max_val
 
 
+def _check_k(k):
+    if k < 0:
+        raise ValueError("k не может быть отрицательным")
+
+
+def top_k(arr, k):
+    """
+    Возвращает k наибольших элементов по убыванию за O(n log k) (куча на k элементов).
+    Если k больше длины массива, возвращаются все элементы.
+    """
+    _check_k(k)
+    return heapq.nlargest(k, arr)
+
+
+def bottom_k(arr, k):
+    """Возвращает k наименьших элементов по возрастанию за O(n log k)."""
+    _check_k(k)
+    return heapq.nsmallest(k, arr)
+
+
+def partial_sort(arr, k):
+    """
+    Частичная сортировка: первые k элементов результата — k наименьших
+    по возрастанию, остальные идут следом в исходном порядке.
+    Исходный массив не изменяется; для array.array результат того же типа.
+    """
+    _check_k(k)
+    source = arr if _is_vector(arr) else list(arr)
+    chosen = heapq.nsmallest(k, range(len(source)), key=source.__getitem__)
+    chosen_set = set(chosen)
+    return _collect_like(arr, itertools.chain(
+        (source[i] for i in chosen),
+        (item for i, item in enumerate(source) if i not in chosen_set)))
+
+
 def bubble_sort(arr):
     """Сортирует массив методом пузырька по возрастанию."""
     if not arr:
@@ -24,26 +184,333 @@ def bubble_sort(arr):
 
 
 def reverse_array(arr):
-    """Возвращает массив в обратном порядке."""
+    """
+    Возвращает массив в обратном порядке.
+    Для numpy.ndarray и memoryview результат — представление без копирования.
+    """
     return arr[::-1]
 
 
-def calculate_average(arr):
-    """Вычисляет среднее арифметическое элементов массива."""
+def calculate_average(arr, parallel=False, workers=None):
+    """
+    Вычисляет среднее арифметическое элементов массива.
+    При parallel=True суммы и длины частей считаются в отдельных процессах.
+    """
+    if _use_parallel(arr, parallel):
+        partial = _map_shards(_chunk_sum, arr, workers)
+        return sum(total for total, _ in partial) / sum(count for _, count in partial)
+    if _is_vector(arr):
+        if _vector_size(arr) == 0:
+            raise ValueError("Массив пуст")
+        if np is not None:
+            return float(np.asarray(arr).mean())
+        return sum(arr) / len(arr)
     if not arr:
         raise ValueError("Массив пуст")
     return sum(arr) / len(arr)
 
 
-def remove_duplicates(arr):
-    """Удаляет дубликаты из массива, сохраняя порядок элементов."""
-    seen = set()
-    result = []
-    for item in arr:
-        if item not in seen:
-            seen.add(item)
-            result.append(item)
-    return result
+# === Множества «уже встречено» для remove_duplicates ===
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(x):
+    """Перемешивание битов (splitmix64), чтобы hash() малых int давал равномерные индексы."""
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+class BloomFilter:
+    """
+    Фильтр Блума фиксированного размера.
+    Проверка «in» может дать ложноположительный ответ с вероятностью
+    около error_rate (при не более чем capacity добавленных элементах),
+    но никогда — ложноотрицательный.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        if capacity <= 0:
+            raise ValueError("Ёмкость фильтра должна быть положительной")
+        if not 0 < error_rate < 1:
+            raise ValueError("Доля ложных срабатываний должна быть в интервале (0, 1)")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item):
+        # Двойное хеширование: h1 + i * h2 (равные элементы дают равные hash())
+        h = _mix64(hash(item) & _MASK64)
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, item):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class _SpillingSet:
+    """
+    Точное множество, которое держит в памяти не больше max_memory_items
+    элементов, а остальные сбрасывает во временную базу SQLite на диске.
+    """
+
+    def __init__(self, max_memory_items):
+        if max_memory_items <= 0:
+            raise ValueError("Лимит элементов в памяти должен быть положительным")
+        self.max_memory_items = max_memory_items
+        self.memory = set()
+        self.path = None
+        self.db = None
+
+    def _spill(self):
+        if self.db is None:
+            fd, self.path = tempfile.mkstemp(suffix=".sqlite")
+            os.close(fd)
+            self.db = sqlite3.connect(self.path)
+            self.db.execute("CREATE TABLE seen (h INTEGER, item BLOB)")
+            self.db.execute("CREATE INDEX seen_h ON seen (h)")
+        self.db.executemany(
+            "INSERT INTO seen VALUES (?, ?)",
+            ((hash(item), pickle.dumps(item)) for item in self.memory),
+        )
+        self.db.commit()
+        self.memory.clear()
+
+    def add(self, item):
+        self.memory.add(item)
+        if len(self.memory) > self.max_memory_items:
+            self._spill()
+
+    def __contains__(self, item):
+        if item in self.memory:
+            return True
+        if self.db is None:
+            return False
+        # Сравниваем через ==, как обычное множество (1 и 1.0 — один элемент)
+        rows = self.db.execute("SELECT item FROM seen WHERE h = ?", (hash(item),))
+        return any(pickle.loads(blob) == item for (blob,) in rows)
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            os.remove(self.path)
+            self.db = None
+
+
+def _make_seen(mode, capacity, error_rate, max_memory_items):
+    """Создаёт множество просмотренных элементов для выбранного режима."""
+    if mode == "exact":
+        return set()
+    if mode == "bloom":
+        return BloomFilter(capacity, error_rate)
+    if mode == "spill":
+        return _SpillingSet(max_memory_items)
+    raise ValueError(f"Неизвестный режим удаления дубликатов: {mode}")
+
+
+def remove_duplicates(arr, mode="exact", error_rate=0.01, capacity=None,
+                      max_memory_items=1_000_000):
+    """
+    Удаляет дубликаты из массива, сохраняя порядок элементов.
+    :param mode: "exact" — обычное множество;
+                 "bloom" — приближённо, фильтр Блума фиксированного размера
+                 (с вероятностью ~error_rate уникальный элемент может быть отброшен);
+                 "spill" — точно, при превышении max_memory_items
+                 просмотренные элементы сбрасываются на диск
+    :param capacity: ожидаемое число различных элементов для "bloom"
+                     (по умолчанию len(arr), для итераторов без длины — 1 000 000)
+    """
+    if capacity is None:
+        # У генераторов и итераторов нет len(): берём ёмкость по умолчанию, как в потоковой версии
+        capacity = max(1, len(arr)) if hasattr(arr, "__len__") else 1_000_000
+    return _collect_like(arr, remove_duplicates_stream(arr, mode=mode, error_rate=error_rate,
+                                                       capacity=capacity, max_memory_items=max_memory_items))
+
+
+# === Потоковые варианты (один проход, память не зависит от длины потока) ===
+
+def iter_chunks(items, size=65536):
+    """Разбивает любой итерируемый объект на списки длиной не больше size."""
+    if size <= 0:
+        raise ValueError("Размер блока должен быть положительным")
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _chunk_sum(chunk):
+    """Возвращает (сумма, количество) для одного блока потока."""
+    if _is_vector(chunk) and np is not None:
+        return np.asarray(chunk).sum().item(), _vector_size(chunk)
+    return sum(chunk), len(chunk)
+
+
+def find_max_stream(items, chunked=False):
+    """
+    Возвращает максимум потока за один проход.
+    :param items: итерируемый объект с числами или (chunked=True) с блоками чисел
+    :param chunked: каждый элемент items — блок (list, array.array, ndarray, ...)
+    """
+    max_val = None
+    if chunked:
+        for chunk in items:
+            if _is_empty(chunk):
+                continue
+            chunk_max = find_max(chunk)
+            if max_val is None or chunk_max > max_val:
+                max_val = chunk_max
+    else:
+        for num in items:
+            if max_val is None or num > max_val:
+                max_val = num
+    if max_val is None:
+        raise ValueError("Массив пуст")
+    return max_val
+
+
+def calculate_average_stream(items, chunked=False):
+    """
+    Вычисляет среднее арифметическое потока за один проход.
+    :param items: итерируемый объект с числами или (chunked=True) с блоками чисел
+    :param chunked: каждый элемент items — блок (list, array.array, ndarray, ...)
+    """
+    total = 0
+    count = 0
+    if chunked:
+        for chunk in items:
+            chunk_total, chunk_count = _chunk_sum(chunk)
+            total += chunk_total
+            count += chunk_count
+    else:
+        for num in items:
+            total += num
+            count += 1
+    if count == 0:
+        raise ValueError("Массив пуст")
+    return total / count
+
+
+def remove_duplicates_stream(items, chunked=False, mode="exact", error_rate=0.01,
+                             capacity=1_000_000, max_memory_items=1_000_000):
+    """
+    Генератор: выдаёт элементы потока без повторов, сохраняя порядок.
+    В режиме "exact" память растёт с числом различных значений;
+    режимы "bloom" и "spill" ограничивают её (см. remove_duplicates).
+    """
+    seen = _make_seen(mode, capacity, error_rate, max_memory_items)
+    if chunked:
+        items = itertools.chain.from_iterable(items)
+    try:
+        for item in items:
+            if item not in seen:
+                seen.add(item)
+                yield item
+    finally:
+        if isinstance(seen, _SpillingSet):
+            seen.close()
+
+
+# === Инкрементально отсортированный контейнер ===
+
+class SortedArray:
+    """
+    Массив, который всегда хранится отсортированным по возрастанию.
+    Вставка и удаление — через bisect (поиск O(log n)), поэтому
+    после добавления нескольких значений не нужно пересортировывать всё.
+    Максимум, минимум и среднее доступны за O(1).
+    С typecode элементы хранятся компактно в array.array.
+    """
+
+    def __init__(self, items=(), typecode=None):
+        self.typecode = typecode
+        self._items = self._container(sort_array(list(items)))
+        self._total = sum(self._items)
+
+    def _container(self, values):
+        if self.typecode is None:
+            return list(values)
+        return array.array(self.typecode, values)
+
+    def add(self, value):
+        """Вставляет значение, сохраняя порядок."""
+        bisect.insort_right(self._items, value)
+        self._total += value
+
+    def update(self, values):
+        """Добавляет пачку значений: сортирует только её и сливает с содержимым."""
+        values = sort_array(list(values))
+        if not values:
+            return
+        self._items = self._container(heapq.merge(self._items, values))
+        self._total += sum(values)
+
+    def remove(self, value):
+        """Удаляет одно вхождение значения; ValueError, если его нет."""
+        i = bisect.bisect_left(self._items, value)
+        if i == len(self._items) or self._items[i] != value:
+            raise ValueError("Элемент не найден")
+        del self._items[i]
+        self._total -= value
+
+    def range_query(self, lo, hi):
+        """Возвращает элементы x, для которых lo <= x <= hi (list или array.array)."""
+        left = bisect.bisect_left(self._items, lo)
+        right = bisect.bisect_right(self._items, hi)
+        return self._items[left:right]
+
+    def count(self, value):
+        return bisect.bisect_right(self._items, value) - bisect.bisect_left(self._items, value)
+
+    @property
+    def max(self):
+        if not self._items:
+            raise ValueError("Массив пуст")
+        return self._items[-1]
+
+    @property
+    def min(self):
+        if not self._items:
+            raise ValueError("Массив пуст")
+        return self._items[0]
+
+    @property
+    def average(self):
+        if not self._items:
+            raise ValueError("Массив пуст")
+        return self._total / len(self._items)
+
+    def to_list(self):
+        return list(self._items)
+
+    def to_array(self):
+        """Содержимое в виде array.array (typecode по умолчанию выбирает make_typed_array)."""
+        return make_typed_array(self._items, self.typecode)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def __contains__(self, value):
+        return self.count(value) > 0
+
+    def __repr__(self):
+        return f"SortedArray({list(self._items)!r})"
 
 
 # # ——————— НАМЕРЕННАЯ ОШИБКА ———————
@@ -63,14 +530,156 @@ def remove_duplicates(arr):
 
 # Исправленная версия bubble_sort
 
-def bubble_sort(arr):
-    """Сортирует массив методом пузырька по возрастанию."""
-    if not arr:
-        return arr
-    sorted_arr = arr.copy()
+def _bubble_sort(sorted_arr):
+    """Сортировка пузырьком на месте с ранним выходом, если обменов не было."""
     n = len(sorted_arr)
     for i in range(n):
+        swapped = False
         for j in range(0, n - i - 1):
             if sorted_arr[j] > sorted_arr[j + 1]:  # Исправлено: > вместо <
                 sorted_arr[j], sorted_arr[j + 1] = sorted_arr[j + 1], sorted_arr[j]
-    return sorted_arr
\ No newline at end of file
+                swapped = True
+        if not swapped:
+            break
+    return sorted_arr
+
+
+# === Движок сортировки ===
+
+# Отрезки короче этого порога досортировываются вставками
+MIN_RUN = 32
+
+
+def _insertion_sort(arr, lo, hi):
+    """Сортирует вставками срез arr[lo:hi] на месте (устойчиво)."""
+    for i in range(lo + 1, hi):
+        item = arr[i]
+        j = i - 1
+        while j >= lo and arr[j] > item:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = item
+    return arr
+
+
+def _merge_into(src, dst, lo, mid, hi):
+    """Сливает отсортированные отрезки src[lo:mid] и src[mid:hi] в dst[lo:hi] (устойчиво)."""
+    i, j, k = lo, mid, lo
+    while i < mid and j < hi:
+        if src[j] < src[i]:
+            dst[k] = src[j]
+            j += 1
+        else:
+            dst[k] = src[i]
+            i += 1
+        k += 1
+    if i < mid:
+        dst[k:hi] = src[i:mid]
+    else:
+        dst[k:hi] = src[j:hi]
+
+
+def _merge_runs(arr, bounds):
+    """
+    Попарно сливает соседние отсортированные отрезки arr, пока не останется один.
+    :param bounds: начала отрезков и в конце len(arr)
+    Слияние идёт поочерёдно между arr и одним буфером того же типа
+    (для array.array — тоже array.array), поэтому рабочие данные
+    остаются компактными и не превращаются в список объектов.
+    """
+    if len(bounds) <= 2:
+        return arr
+    src, dst = arr, _working_copy(arr)
+    while len(bounds) > 2:
+        runs = len(bounds) - 1
+        merged = [0]
+        for k in range(0, runs, 2):
+            lo, mid, hi = bounds[k], bounds[k + 1], bounds[min(k + 2, runs)]
+            if mid == hi:  # непарный последний отрезок переносится как есть
+                dst[lo:hi] = src[lo:hi]
+            else:
+                _merge_into(src, dst, lo, mid, hi)
+            merged.append(hi)
+        bounds = merged
+        src, dst = dst, src
+    return src
+
+
+def _merge_sort(arr):
+    """Сортировка слиянием снизу вверх; короткие блоки сортируются вставками."""
+    n = len(arr)
+    for lo in range(0, n, MIN_RUN):
+        _insertion_sort(arr, lo, min(lo + MIN_RUN, n))
+    return _merge_runs(arr, list(range(0, n, MIN_RUN)) + [n])
+
+
+def _find_runs(arr):
+    """
+    Разбивает массив на уже упорядоченные отрезки и возвращает их границы
+    (начала отрезков и в конце len(arr)). Строго убывающие отрезки
+    разворачиваются, короткие отрезки дополняются до MIN_RUN
+    и досортировываются вставками.
+    """
+    n = len(arr)
+    bounds = []
+    lo = 0
+    while lo < n:
+        hi = lo + 1
+        if hi < n and arr[hi] < arr[lo]:
+            while hi < n and arr[hi] < arr[hi - 1]:
+                hi += 1
+            arr[lo:hi] = arr[lo:hi][::-1]
+        else:
+            while hi < n and not arr[hi] < arr[hi - 1]:
+                hi += 1
+        if hi - lo < MIN_RUN:
+            end = min(lo + MIN_RUN, n)
+            _insertion_sort(arr, lo, end)
+            hi = end
+        bounds.append(lo)
+        lo = hi
+    bounds.append(n)
+    return bounds
+
+
+def _hybrid_sort(arr):
+    """Адаптивная сортировка: поиск готовых отрезков + вставки + слияние."""
+    if len(arr) <= MIN_RUN:
+        return _insertion_sort(arr, 0, len(arr))
+    return _merge_runs(arr, _find_runs(arr))
+
+
+SORT_ALGORITHMS = {
+    "hybrid": _hybrid_sort,
+    "merge": _merge_sort,
+    "insertion": lambda arr: _insertion_sort(arr, 0, len(arr)),
+    "bubble": _bubble_sort,
+    "builtin": sorted,
+}
+
+
+def sort_array(arr, algorithm="hybrid", parallel=False, workers=None):
+    """
+    Сортирует массив по возрастанию, не изменяя исходный массив.
+    :param arr: последовательность сравнимых элементов
+    :param algorithm: "hybrid" (по умолчанию), "merge", "insertion", "bubble" или "builtin"
+    :param parallel: сортировать части в отдельных процессах и сливать их (k-way merge)
+    :param workers: число процессов (по умолчанию — по числу ядер)
+    :return: новый отсортированный список (для array.array, memoryview и ndarray —
+             array.array / ndarray того же типа элементов)
+    """
+    try:
+        sort_func = SORT_ALGORITHMS[algorithm]
+    except KeyError:
+        raise ValueError(f"Неизвестный алгоритм сортировки: {algorithm}") from None
+    if _is_empty(arr):
+        return arr
+    if _use_parallel(arr, parallel):
+        shards = _map_shards(functools.partial(sort_array, algorithm=algorithm), arr, workers)
+        return _collect_like(arr, heapq.merge(*shards))
+    return _wrap_like(arr, sort_func(_working_copy(arr)))
+
+
+def bubble_sort(arr, algorithm="hybrid", parallel=False, workers=None):
+    """Сортирует массив по возрастанию (см. sort_array; исходный метод — algorithm="bubble")."""
+    return sort_array(arr, algorithm, parallel=parallel, workers=workers)
\ No newline at end of file
@@ -0,0 +1,150 @@
+# benchmark_array_operations.py
+#
+# Замеры производительности функций array_operations.
+# Пример:
+#   python benchmark_array_operations.py --max-size 100000 --output results.json
+#   python benchmark_array_operations.py --save-baseline          # сохранить эталон
+#   python benchmark_array_operations.py --baseline benchmark_baseline.json --threshold 1.5
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+
+import array_operations
+
+
+# === Функции под замером: (имя, вызов) ===
+
+FUNCTIONS = [
+    ("find_max", array_operations.find_max),
+    ("bubble_sort", array_operations.bubble_sort),
+    ("sort_array", array_operations.sort_array),
+    ("top_k", lambda arr: array_operations.top_k(arr, 10)),
+    ("partial_sort", lambda arr: array_operations.partial_sort(arr, 10)),
+    ("reverse_array", array_operations.reverse_array),
+    ("calculate_average", array_operations.calculate_average),
+    ("remove_duplicates", array_operations.remove_duplicates),
+    ("find_max_stream", lambda arr: array_operations.find_max_stream(iter(arr))),
+    ("calculate_average_stream", lambda arr: array_operations.calculate_average_stream(iter(arr))),
+    ("remove_duplicates_stream", lambda arr: list(array_operations.remove_duplicates_stream(iter(arr)))),
+]
+
+
+# === Формы входных данных ===
+
+def make_input(shape, size, seed=0):
+    rng = random.Random(seed)
+    if shape == "sorted":
+        return list(range(size))
+    if shape == "reversed":
+        return list(range(size, 0, -1))
+    if shape == "random":
+        return [rng.random() for _ in range(size)]
+    if shape == "duplicates":
+        return [rng.randint(0, 9) for _ in range(size)]
+    raise ValueError(f"Неизвестная форма данных: {shape}")
+
+
+SHAPES = ["sorted", "reversed", "random", "duplicates"]
+SIZES = [10 ** p for p in range(1, 8)]  # 10 … 10⁷
+
+# Замеры быстрее этого порога считаются шумом и не проверяются на регрессию
+NOISE_FLOOR = 0.001
+
+
+def time_call(func, arr, repeat):
+    """Минимальное время из repeat запусков, в секундах."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arr)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(sizes=SIZES, shapes=SHAPES, functions=FUNCTIONS, repeat=3):
+    results = []
+    for size in sizes:
+        # Для больших массивов одного запуска достаточно
+        runs = repeat if size <= 100_000 else 1
+        for shape in shapes:
+            arr = make_input(shape, size)
+            for name, func in functions:
+                seconds = time_call(func, arr, runs)
+                results.append({"function": name, "shape": shape, "size": size, "seconds": seconds})
+                print(f"{name:26} {shape:10} {size:>10}  {seconds * 1000:10.3f} ms")
+    return results
+
+
+def _key(entry):
+    return entry["function"], entry["shape"], entry["size"]
+
+
+def find_regressions(results, baseline, threshold):
+    """Возвращает замеры, которые медленнее эталона более чем в threshold раз."""
+    reference = {_key(entry): entry["seconds"] for entry in baseline}
+    regressions = []
+    for entry in results:
+        old = reference.get(_key(entry))
+        if old is None or entry["seconds"] < NOISE_FLOOR:
+            continue
+        if entry["seconds"] > old * threshold:
+            regressions.append({**entry, "baseline": old, "ratio": entry["seconds"] / old})
+    return regressions
+
+
+def save_report(path, results):
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def load_report(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки array_operations")
+    parser.add_argument("--max-size", type=int, default=SIZES[-1], help="наибольший размер массива")
+    parser.add_argument("--repeat", type=int, default=3, help="число повторов для малых размеров")
+    parser.add_argument("--output", default="benchmark_results.json", help="куда записать результаты")
+    parser.add_argument("--baseline", default=None, help="файл эталона для проверки регрессий")
+    parser.add_argument("--threshold", type=float, default=1.5,
+                        help="допустимое замедление относительно эталона (во сколько раз)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="записать результаты как эталон benchmark_baseline.json")
+    args = parser.parse_args(argv)
+
+    sizes = [size for size in SIZES if size <= args.max_size]
+    results = run_benchmarks(sizes=sizes, repeat=args.repeat)
+    save_report(args.output, results)
+    print(f"\n📄 Результаты записаны в {args.output}")
+
+    if args.save_baseline:
+        save_report("benchmark_baseline.json", results)
+        print("📌 Эталон сохранён в benchmark_baseline.json")
+
+    if args.baseline:
+        regressions = find_regressions(results, load_report(args.baseline), args.threshold)
+        if regressions:
+            print(f"\n🐢 Обнаружены регрессии (порог ×{args.threshold}):")
+            for entry in regressions:
+                print(f"   {entry['function']} [{entry['shape']}, n={entry['size']}]: "
+                      f"{entry['baseline'] * 1000:.3f} → {entry['seconds'] * 1000:.3f} ms "
+                      f"(×{entry['ratio']:.2f})")
+            return 1
+        print("\n🎉 Регрессий нет.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,17 @@
 # mutation_test.py
 
-import importlib
+import argparse
+import os
 import sys
-from io import StringIO
+import time
 import unittest
 
-# Импортируем тестируемый модуль
+# Импортируем тестируемый модуль и тесты — один раз, без перезагрузки на каждого мутанта
 import array_operations
+from test_array_operations import TestArrayOperations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mutation_engine import captured_output, hot_swap, run_processes
 
 
 # === МУТАНТЫ функции bubble_sort ===
@@ -75,6 +80,20 @@ def bubble_sort_mutant6(arr):
     return sorted_arr
 
 
+# Мутант 7: Забыли увеличить счётчик — цикл никогда не завершается
+def bubble_sort_mutant7(arr):
+    if not arr:
+        return arr
+    sorted_arr = arr.copy()
+    n = len(sorted_arr)
+    i = 0
+    while i < n:  # ОШИБКА: нет i += 1
+        for j in range(0, n - i - 1):
+            if sorted_arr[j] > sorted_arr[j + 1]:
+                sorted_arr[j], sorted_arr[j + 1] = sorted_arr[j + 1], sorted_arr[j]
+    return sorted_arr
+
+
 # Список всех мутантов
 mutants = [
     ("Mutant 1: Sort in descending order (< instead of >)", bubble_sort_mutant1),
@@ -83,59 +102,76 @@ mutants = [
     ("Mutant 4: No swap (pass)", bubble_sort_mutant4),
     ("Mutant 5: Return original array", bubble_sort_mutant5),
     ("Mutant 6: Always sort descending", bubble_sort_mutant6),
+    ("Mutant 7: Infinite loop (no i += 1)", bubble_sort_mutant7),
 ]
 
 
 # Функция для запуска теста с подменённой функцией
 def run_test_with_mutant(mutant_func):
-    # Подменяем функцию в модуле
-    array_operations.bubble_sort = mutant_func
-
-    # Перезагружаем тестовый модуль
-    if 'test_array_operations' in sys.modules:
-        importlib.reload(sys.modules['test_array_operations'])
-    from test_array_operations import TestArrayOperations
-
     # Загружаем только тесты для bubble_sort
     loader = unittest.TestLoader()
     suite = loader.loadTestsFromTestCase(TestArrayOperations)
     result = unittest.TestResult()
 
-    # Запускаем тесты
-    old_stdout = sys.stdout
-    sys.stdout = captured_output = StringIO()
-    suite.run(result)
-    sys.stdout = old_stdout
+    # Подменяем код bubble_sort на месте: тесты (from array_operations import *)
+    # ссылаются на тот же объект функции, поэтому перезагружать их не нужно
+    # Вывод перехватывается только в текущем потоке (см. captured_output)
+    with captured_output() as output, hot_swap(array_operations.bubble_sort, mutant_func):
+        suite.run(result)
 
     # Если есть падения или ошибки — мутант убит
     if len(result.failures) > 0 or len(result.errors) > 0:
-        return False, captured_output.getvalue()  # Убит
+        return False, output.getvalue()  # Убит
     else:
-        return True, captured_output.getvalue()  # Выжил
+        return True, output.getvalue()  # Выжил
+
+
+# === Параллельный запуск: каждый мутант — в отдельном процессе ===
+
+def _mutant_worker(index, conn):
+    """Выполняется в дочернем процессе: подмена функции не влияет на другие мутанты."""
+    start = time.perf_counter()
+    survived, output = run_test_with_mutant(mutants[index][1])
+    conn.send(("survived" if survived else "killed", time.perf_counter() - start))
+    conn.close()
+
+
+def run_mutants_parallel(workers=None, timeout=10.0):
+    """
+    Запускает мутантов в пуле не более чем из workers процессов
+    (mutation_engine.run_processes). Мутант, не уложившийся в timeout
+    секунд, останавливается и считается убитым (статус "timeout");
+    упавший без отчёта процесс — тоже убит.
+    :return: список (имя, статус, время в секундах) в порядке mutants
+    """
+    results = run_processes(_mutant_worker, range(len(mutants)), workers=workers, timeout=timeout,
+                            crashed=lambda exitcode, elapsed: ("killed", elapsed),
+                            timed_out=lambda elapsed: ("timeout", elapsed))
+    return [(mutants[i][0],) + results[i] for i in range(len(mutants))]
 
 
 # === ОСНОВНОЙ БЛОК ===
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Мутационное тестирование bubble_sort")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов (по умолчанию — ядра)")
+    parser.add_argument("--timeout", type=float, default=10.0, help="лимит времени на мутанта, сек")
+    args = parser.parse_args()
+
     print("🧪 Начинаем мутационное тестирование функции bubble_sort...\n")
-    killed = 0
-    total = len(mutants)
-
-    for name, mutant in mutants:
-        print(f"🔁 Тестируем: {name}")
-        survived = run_test_with_mutant(mutant)
-        if not survived[0]:
-            print(f"❌ Мутант убит — тест обнаружил ошибку")
-            killed += 1
-        else:
-            print(f"✅ Мутант выжил — тест НЕ обнаружил ошибку")
-        print()
-
-    # Восстанавливаем оригинальную функцию
-    importlib.reload(array_operations)
+    report = run_mutants_parallel(workers=args.workers, timeout=args.timeout)
+
+    icons = {"killed": "❌ убит", "timeout": "⏱️  убит по таймауту", "survived": "✅ выжил"}
+    for name, status, elapsed in report:
+        print(f"🔁 {name:55} {icons[status]:22} {elapsed:6.2f} с")
+    print()
+
+    total = len(report)
+    killed = sum(status != "survived" for _, status, _ in report)
+    timed_out = sum(status == "timeout" for _, status, _ in report)
 
     # Отчёт
     print(f"📊 Результаты мутационного тестирования:")
-    print(f"   Убито мутантов: {killed}/{total}")
+    print(f"   Убито мутантов: {killed}/{total} (из них по таймауту: {timed_out})")
     print(f"   Процент убитых: {killed / total * 100:.1f}%")
 
     if killed == total:
@@ -143,4 +179,4 @@ if __name__ == "__main__":
     elif killed == 0:
         print("💀 Плохо! Ни один мутант не был обнаружен — тесты бесполезны.")
     else:
-        print("⚠️  Некоторые мутанты выжили — нужно улучшить тесты.")
\ No newline at end of file
+        print("⚠️  Некоторые мутанты выжили — нужно улучшить тесты.")
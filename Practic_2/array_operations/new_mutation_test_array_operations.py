@@ -1,12 +1,15 @@
 # mutation_test.py
 
-import importlib
+import os
 import sys
-from io import StringIO
 import unittest
 
-# Импортируем тестируемый модуль
+# Импортируем тестируемый модуль и тесты — один раз, без перезагрузки на каждого мутанта
 import array_operations
+from new_test_array_operations import TestArrayOperations
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from mutation_engine import captured_output, hot_swap
 
 
 # === МУТАНТЫ функции bubble_sort ===
@@ -90,30 +93,22 @@ mutants = [
 
 # Функция для запуска теста с подменённой функцией
 def run_test_with_mutant(mutant_func):
-    # Подменяем функцию в модуле
-    array_operations.bubble_sort = mutant_func
-
-    # Перезагружаем тестовый модуль
-    if 'new_test_array_operations' in sys.modules:
-        importlib.reload(sys.modules['new_test_array_operations'])
-    from new_test_array_operations import TestArrayOperations
-
     # Загружаем только тесты для bubble_sort
     loader = unittest.TestLoader()
     suite = loader.loadTestsFromTestCase(TestArrayOperations)
     result = unittest.TestResult()
 
-    # Запускаем тесты
-    old_stdout = sys.stdout
-    sys.stdout = captured_output = StringIO()
-    suite.run(result)
-    sys.stdout = old_stdout
+    # Подменяем код bubble_sort на месте: тесты (from array_operations import *)
+    # ссылаются на тот же объект функции, поэтому перезагружать их не нужно
+    # Вывод перехватывается только в текущем потоке (см. captured_output)
+    with captured_output() as output, hot_swap(array_operations.bubble_sort, mutant_func):
+        suite.run(result)
 
     # Если есть падения или ошибки — мутант убит
     if len(result.failures) > 0 or len(result.errors) > 0:
-        return False, captured_output.getvalue()  # Убит
+        return False, output.getvalue()  # Убит
     else:
-        return True, captured_output.getvalue()  # Выжил
+        return True, output.getvalue()  # Выжил
 
 
 # === ОСНОВНОЙ БЛОК ===
@@ -132,9 +127,6 @@ if __name__ == "__main__":
             print(f"✅ Мутант выжил — тест НЕ обнаружил ошибку")
         print()
 
-    # Восстанавливаем оригинальную функцию
-    importlib.reload(array_operations)
-
     # Отчёт
     print(f"📊 Результаты мутационного тестирования:")
     print(f"   Убито мутантов: {killed}/{total}")
@@ -1,8 +1,16 @@
 # test_array_operations.py
 
+import contextlib
+import io
+import json
+import os
+import tempfile
 import unittest
+from unittest import mock
 from array_operations import *
 
+import benchmark_array_operations
+
 
 class TestArrayOperations(unittest.TestCase):
 
@@ -41,6 +49,49 @@ class TestArrayOperations(unittest.TestCase):
         result = bubble_sort(arr)
         self.assertEqual(len(result), len(arr))
 
+    # --- Тесты для движка сортировки ---
+
+    def test_sort_array_algorithms_agree(self):
+        import random
+        rng = random.Random(42)
+        cases = [
+            [rng.randint(-1000, 1000) for _ in range(500)],
+            list(range(300)),
+            list(range(300, 0, -1)),
+            [rng.randint(0, 5) for _ in range(200)],
+            list(range(100)) + list(range(50, 0, -1)) + [7] * 40,
+        ]
+        for arr in cases:
+            for algorithm in SORT_ALGORITHMS:
+                self.assertEqual(sort_array(arr, algorithm=algorithm), sorted(arr), algorithm)
+
+    def test_sort_array_does_not_mutate(self):
+        arr = [5, 3, 9, 1] * 20
+        original = list(arr)
+        sort_array(arr)
+        self.assertEqual(arr, original)
+
+    def test_sort_array_is_stable(self):
+        class Key:
+            def __init__(self, key, tag):
+                self.key, self.tag = key, tag
+
+            def __lt__(self, other):
+                return self.key < other.key
+
+            def __gt__(self, other):
+                return self.key > other.key
+
+        arr = [Key(i % 3, i) for i in range(100, 0, -1)]
+        for algorithm in SORT_ALGORITHMS:
+            result = sort_array(arr, algorithm=algorithm)
+            pairs = [(k.key, k.tag) for k in result]
+            self.assertEqual(pairs, sorted(pairs, key=lambda p: p[0]), algorithm)
+
+    def test_sort_array_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            sort_array([1, 2], algorithm="quantum")
+
     # --- Остальные функции ---
 
     def test_find_max(self):
@@ -50,6 +101,57 @@ class TestArrayOperations(unittest.TestCase):
         with self.assertRaises(ValueError):
             find_max([])
 
+    def test_top_k_bottom_k(self):
+        arr = [5, 1, 9, 3, 9, 7, -2]
+        self.assertEqual(top_k(arr, 3), [9, 9, 7])
+        self.assertEqual(bottom_k(arr, 2), [-2, 1])
+        self.assertEqual(top_k(arr, 0), [])
+        self.assertEqual(bottom_k(arr, 100), sorted(arr))
+        self.assertEqual(top_k(iter(arr), 1), [9])
+        with self.assertRaises(ValueError):
+            top_k(arr, -1)
+
+    def test_partial_sort(self):
+        arr = [5, 1, 9, 3, 9, 7, -2]
+        result = partial_sort(arr, 3)
+        self.assertEqual(result[:3], [-2, 1, 3])
+        self.assertEqual(result[3:], [5, 9, 9, 7])
+        self.assertEqual(arr, [5, 1, 9, 3, 9, 7, -2])
+        self.assertEqual(partial_sort(arr, len(arr)), sorted(arr))
+        self.assertEqual(partial_sort([], 2), [])
+        with self.assertRaises(ValueError):
+            partial_sort(arr, -3)
+
+    def test_sorted_array(self):
+        sa = SortedArray([5, 1, 4])
+        sa.add(3)
+        sa.add(10)
+        sa.update([2, 8, 2])
+        self.assertEqual(sa.to_list(), [1, 2, 2, 3, 4, 5, 8, 10])
+        self.assertEqual(sa.max, 10)
+        self.assertEqual(sa.min, 1)
+        self.assertAlmostEqual(sa.average, 35 / 8)
+        self.assertEqual(sa.range_query(2, 5), [2, 2, 3, 4, 5])
+        self.assertEqual(sa.count(2), 2)
+        sa.remove(10)
+        sa.remove(2)
+        self.assertEqual(sa.to_list(), [1, 2, 3, 4, 5, 8])
+        self.assertEqual(sa.max, 8)
+        self.assertAlmostEqual(sa.average, 23 / 6)
+        self.assertIn(3, sa)
+        self.assertNotIn(7, sa)
+        self.assertEqual(find_max(sa), 8)
+        with self.assertRaises(ValueError):
+            sa.remove(7)
+
+    def test_sorted_array_empty(self):
+        sa = SortedArray()
+        self.assertEqual(len(sa), 0)
+        with self.assertRaises(ValueError):
+            sa.max
+        with self.assertRaises(ValueError):
+            sa.average
+
     def test_reverse_array(self):
         self.assertEqual(reverse_array([1, 2, 3]), [3, 2, 1])
         self.assertEqual(reverse_array([]), [])
@@ -61,11 +163,231 @@ class TestArrayOperations(unittest.TestCase):
         with self.assertRaises(ValueError):
             calculate_average([])
 
+    # --- Векторные входы (array.array, memoryview, numpy) ---
+
+    def test_vector_inputs(self):
+        import array
+        typed = array.array('d', [1.5, -2.0, 4.5, 0.0])
+        for arr in (typed, memoryview(typed)):
+            self.assertEqual(find_max(arr), 4.5)
+            self.assertAlmostEqual(calculate_average(arr), 1.0)
+            self.assertEqual(list(reverse_array(arr)), [0.0, 4.5, -2.0, 1.5])
+        empty = array.array('i')
+        for arr in (empty, memoryview(empty)):
+            with self.assertRaises(ValueError):
+                find_max(arr)
+            with self.assertRaises(ValueError):
+                calculate_average(arr)
+
+    def test_numpy_inputs(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("NumPy не установлен")
+        arr = np.array([3, 7, -1, 5])
+        self.assertEqual(find_max(arr), 7)
+        self.assertAlmostEqual(calculate_average(arr), 3.5)
+        self.assertEqual(reverse_array(arr).tolist(), [5, -1, 7, 3])
+        self.assertEqual(sort_array(arr).tolist(), [-1, 3, 5, 7])
+        self.assertEqual(remove_duplicates(np.array([2, 2, 1])).tolist(), [2, 1])
+        with self.assertRaises(ValueError):
+            find_max(np.array([]))
+        with self.assertRaises(ValueError):
+            calculate_average(np.array([]))
+
+    # --- Компактное хранение ---
+
+    def test_make_typed_array(self):
+        import array
+        ints = make_typed_array([3, 1, 2])
+        floats = make_typed_array([1.5, 2])
+        self.assertIsInstance(ints, array.array)
+        self.assertEqual(ints.typecode, "q")
+        self.assertEqual(floats.typecode, "d")
+        self.assertEqual(make_typed_array([1, 2], "i").typecode, "i")
+
+    def test_typed_inputs_keep_their_type(self):
+        import array
+        typed = make_typed_array([5, 3, 9, 3, 1, 9] * 10)
+        for algorithm in SORT_ALGORITHMS:
+            result = sort_array(typed, algorithm=algorithm)
+            self.assertIsInstance(result, array.array, algorithm)
+            self.assertEqual(result.typecode, "q")
+            self.assertEqual(list(result), sorted(typed))
+        self.assertEqual(list(typed[:6]), [5, 3, 9, 3, 1, 9])
+        self.assertEqual(sort_array(memoryview(typed)), array.array("q", sorted(typed)))
+        self.assertEqual(remove_duplicates(typed), array.array("q", [5, 3, 9, 1]))
+        self.assertEqual(partial_sort(typed, 2)[:2], array.array("q", [1, 1]))
+        self.assertEqual(top_k(typed, 2), [9, 9])
+        self.assertEqual(reverse_array(typed)[:3], array.array("q", [9, 1, 3]))
+
+    def test_typed_parallel_sort(self):
+        import array
+        data = make_typed_array(range(PARALLEL_MIN_SIZE, 0, -1))
+        result = sort_array(memoryview(data), parallel=True, workers=2)
+        self.assertIsInstance(result, array.array)
+        self.assertEqual(list(result), list(range(1, PARALLEL_MIN_SIZE + 1)))
+
+    def test_typed_inputs_stay_compact(self):
+        # Рабочие данные остаются в array.array: пик памяти — несколько буферов
+        # по 8 байт на элемент, без объекта float (24 байта) на каждый элемент
+        import array
+        import random
+        import tracemalloc
+        rng = random.Random(0)
+        n = 20_000
+        typed = array.array("d", (rng.random() for _ in range(n)))
+        for name, func in (("sort_array", sort_array),
+                           ("partial_sort", lambda arr: partial_sort(arr, 10)),
+                           ("remove_duplicates", lambda arr: remove_duplicates(arr, mode="bloom"))):
+            tracemalloc.start()
+            try:
+                result = func(typed)
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            self.assertIsInstance(result, array.array)
+            self.assertLess(peak, 3 * n * typed.itemsize, name)
+
+    def test_sorted_array_typed(self):
+        import array
+        sa = SortedArray([4.5, 1.0], typecode="d")
+        sa.add(2.5)
+        sa.update([0.5, 3.0])
+        sa.remove(1.0)
+        self.assertIsInstance(sa.range_query(0, 10), array.array)
+        self.assertEqual(sa.to_list(), [0.5, 2.5, 3.0, 4.5])
+        self.assertEqual(sa.max, 4.5)
+        self.assertAlmostEqual(sa.average, 2.625)
+        self.assertEqual(sa.to_array().typecode, "d")
+
+    # --- Потоковые варианты ---
+
+    def test_stream_reducers(self):
+        data = [4, -2, 9, 4, 1, 9, 0]
+        self.assertEqual(find_max_stream(iter(data)), 9)
+        self.assertAlmostEqual(calculate_average_stream(x for x in data), 25 / 7)
+        self.assertEqual(list(remove_duplicates_stream(iter(data))), [4, -2, 9, 1, 0])
+
+    def test_stream_reducers_chunked(self):
+        import array
+        data = list(range(-50, 51)) * 3
+        chunks = list(iter_chunks(data, size=7))
+        self.assertTrue(all(len(chunk) <= 7 for chunk in chunks))
+        self.assertEqual(find_max_stream(chunks, chunked=True), 50)
+        self.assertAlmostEqual(calculate_average_stream(chunks, chunked=True), 0.0)
+        self.assertEqual(list(remove_duplicates_stream(chunks, chunked=True)), list(range(-50, 51)))
+        typed = [array.array('i', chunk) for chunk in chunks] + [array.array('i')]
+        self.assertEqual(find_max_stream(typed, chunked=True), 50)
+
+    def test_stream_reducers_empty(self):
+        with self.assertRaises(ValueError):
+            find_max_stream(iter([]))
+        with self.assertRaises(ValueError):
+            calculate_average_stream([[], []], chunked=True)
+        self.assertEqual(list(remove_duplicates_stream([])), [])
+        with self.assertRaises(ValueError):
+            list(iter_chunks([1], size=0))
+
+    # --- Режимы remove_duplicates с ограниченной памятью ---
+
+    def test_remove_duplicates_spill_mode(self):
+        import random
+        rng = random.Random(7)
+        data = [rng.randint(0, 300) for _ in range(2000)] + [1.0, True, "a", "a"]
+        expected = remove_duplicates(data)
+        self.assertEqual(remove_duplicates(data, mode="spill", max_memory_items=16), expected)
+
+    def test_remove_duplicates_bloom_mode(self):
+        data = list(range(1000)) * 2
+        result = remove_duplicates(data, mode="bloom", error_rate=0.01)
+        # Фильтр Блума не пропускает повторов и теряет лишь малую долю уникальных
+        self.assertEqual(len(result), len(set(result)))
+        self.assertEqual(result, sorted(result))
+        self.assertGreater(len(result), 950)
+        self.assertEqual(remove_duplicates([3, 1, 3, 2, 1], mode="bloom"), [3, 1, 2])
+
+    def test_remove_duplicates_generator(self):
+        # Итераторы без len() принимаются во всех режимах
+        for mode in ("exact", "bloom", "spill"):
+            result = remove_duplicates((x % 7 for x in range(50)), mode=mode)
+            self.assertEqual(result, list(range(7)))
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(capacity=100, error_rate=0.05)
+        for i in range(100):
+            bloom.add(i)
+        self.assertTrue(all(i in bloom for i in range(100)))
+        false_positives = sum(i in bloom for i in range(1000, 11000))
+        self.assertLess(false_positives / 10000, 0.1)
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity=10, error_rate=1.5)
+
+    def test_remove_duplicates_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            remove_duplicates([1, 1], mode="magic")
+
+    # --- Параллельный режим ---
+
+    def test_parallel_matches_serial(self):
+        import random
+        rng = random.Random(3)
+        data = [rng.randint(-10**6, 10**6) for _ in range(PARALLEL_MIN_SIZE * 2 + 1)]
+        self.assertEqual(sort_array(data, parallel=True, workers=3), sorted(data))
+        self.assertEqual(bubble_sort(data, algorithm="merge", parallel=True, workers=2), sorted(data))
+        self.assertEqual(find_max(data, parallel=True, workers=4), max(data))
+        self.assertAlmostEqual(calculate_average(data, parallel=True, workers=4), sum(data) / len(data))
+
+    def test_parallel_small_input_runs_serially(self):
+        self.assertEqual(sort_array([3, 1, 2], parallel=True), [1, 2, 3])
+        self.assertEqual(find_max([3, 1, 2], parallel=True), 3)
+        with self.assertRaises(ValueError):
+            calculate_average([], parallel=True)
+
     def test_remove_duplicates(self):
         self.assertEqual(remove_duplicates([1, 2, 2, 3, 1]), [1, 2, 3])
         self.assertEqual(remove_duplicates([]), [])
         self.assertEqual(remove_duplicates([5, 5, 5]), [5])
 
 
+
+class TestBenchmarkRegressions(unittest.TestCase):
+
+    @staticmethod
+    def entry(function, seconds, size=1000):
+        return {"function": function, "shape": "random", "size": size, "seconds": seconds}
+
+    def test_find_regressions(self):
+        baseline = [self.entry("sort_array", 0.010), self.entry("find_max", 0.010),
+                    self.entry("top_k", 0.0001)]
+        results = [
+            self.entry("sort_array", 0.020),    # ×2 — регрессия
+            self.entry("find_max", 0.014),      # ×1.4 — в пределах порога
+            self.entry("top_k", 0.0009),        # ×9, но ниже NOISE_FLOOR — шум
+            self.entry("reverse_array", 0.5),   # нет в эталоне
+            self.entry("sort_array", 0.5, size=10),  # другой размер — нет в эталоне
+        ]
+        regressions = benchmark_array_operations.find_regressions(results, baseline, threshold=1.5)
+        self.assertEqual([entry["function"] for entry in regressions], ["sort_array"])
+        self.assertEqual(regressions[0]["baseline"], 0.010)
+        self.assertAlmostEqual(regressions[0]["ratio"], 2.0)
+        self.assertEqual(benchmark_array_operations.find_regressions(results, baseline, threshold=2.5), [])
+
+    def test_main_exit_status(self):
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, "baseline.json")
+            output = os.path.join(directory, "results.json")
+            benchmark_array_operations.save_report(baseline, [self.entry("sort_array", 0.010)])
+            for seconds, expected in ((0.030, 1), (0.011, 0)):
+                with mock.patch.object(benchmark_array_operations, "run_benchmarks",
+                                       return_value=[self.entry("sort_array", seconds)]), \
+                        contextlib.redirect_stdout(io.StringIO()):
+                    code = benchmark_array_operations.main(
+                        ["--max-size", "10", "--output", output, "--baseline", baseline, "--threshold", "1.5"])
+                self.assertEqual(code, expected)
+            with open(output, encoding="utf-8") as f:
+                self.assertEqual(json.load(f)["results"], [self.entry("sort_array", 0.011)])
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
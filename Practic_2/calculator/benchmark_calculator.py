@@ -0,0 +1,141 @@
+# benchmark_calculator.py
+#
+# Пропускная способность арифметики calculator на разных числовых бэкендах.
+# Пример:
+#   python benchmark_calculator.py
+#   python benchmark_calculator.py --count 200000 --output calculator_results.json
+#   python benchmark_calculator.py --modular-count 5000
+
+import argparse
+import decimal
+import json
+import platform
+import random
+import sys
+import time
+
+import calculator
+
+
+# Бэкенды под замером: (имя, объект калькулятора)
+BACKENDS = [
+    ("float", calculator.get_calculator("float")),
+    ("decimal-28", calculator.get_calculator("decimal", context=decimal.Context(prec=28))),
+    ("decimal-100", calculator.get_calculator("decimal", context=decimal.Context(prec=100))),
+    ("fraction", calculator.get_calculator("fraction")),
+]
+
+OPERATIONS = ["add", "divide", "power"]
+
+
+def make_operands(operation, count, seed=0):
+    """Пары аргументов: небольшие целые показатели для power, делители без нуля для divide."""
+    rng = random.Random(seed)
+    if operation == "power":
+        return [(rng.uniform(0.5, 2.0), rng.randint(1, 20)) for _ in range(count)]
+    return [(rng.uniform(-1000, 1000), rng.uniform(1, 1000)) for _ in range(count)]
+
+
+def prepare(calc, operands):
+    """Переводит аргументы в числа бэкенда заранее, чтобы замерять только арифметику."""
+    convert = getattr(calc, "convert", None)
+    if convert is None:
+        return operands
+    return [(convert(a), b if isinstance(b, int) else convert(b)) for a, b in operands]
+
+
+def time_operation(func, operands, repeat):
+    """Минимальное время из repeat проходов по всем парам, в секундах."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for a, b in operands:
+            func(a, b)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmarks(count=100_000, repeat=3, backends=BACKENDS, operations=OPERATIONS):
+    results = []
+    for operation in operations:
+        operands = make_operands(operation, count)
+        baseline = None
+        for name, calc in backends:
+            seconds = time_operation(getattr(calc, operation), prepare(calc, operands), repeat)
+            baseline = baseline or seconds
+            results.append({"operation": operation, "backend": name, "count": count,
+                            "seconds": seconds, "ops_per_second": count / seconds,
+                            "slowdown": seconds / baseline})
+            print(f"{operation:8} {name:12} {count / seconds:14,.0f} оп/с   ×{seconds / baseline:6.1f}")
+    return results
+
+
+# === Модульное возведение в степень ===
+
+MODULAR_BITS = [12, 256, 2048]
+
+# Без модульной формы power приходится вычислять степень целиком и брать остаток:
+# для больших показателей это неосуществимо, поэтому замер — только до 12 бит
+NAIVE_MAX_BITS = 12
+
+
+def run_modular_benchmarks(count=1000, bits_list=MODULAR_BITS, repeat=3):
+    """Сравнивает power(b, e) % m, power(b, e, m) и power_batch при общем основании."""
+    results = []
+    for bits in bits_list:
+        rng = random.Random(bits)
+        mod = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+        base = rng.randrange(2, mod)
+        exponents = [rng.getrandbits(bits) for _ in range(count)]
+        methods = [
+            ("power(b, e, m)", lambda: [calculator.power(base, e, mod) for e in exponents]),
+            ("power_batch", lambda: calculator.power_batch(base, exponents, mod)),
+        ]
+        if bits <= NAIVE_MAX_BITS:
+            methods.insert(0, ("power(b, e) % m", lambda: [calculator.power(base, e) % mod for e in exponents]))
+        baseline = None
+        for name, run in methods:
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - start)
+            baseline = baseline or best
+            results.append({"operation": "modular power", "method": name, "bits": bits, "count": count,
+                            "seconds": best, "ops_per_second": count / best, "speedup": baseline / best})
+            print(f"{bits:5} бит  {name:16} {count / best:14,.0f} оп/с   ×{baseline / best:6.2f}")
+    return results
+
+
+def save_report(path, results):
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Бенчмарки числовых бэкендов calculator")
+    parser.add_argument("--count", type=int, default=100_000, help="число операций в проходе")
+    parser.add_argument("--repeat", type=int, default=3, help="число проходов (берётся лучший)")
+    parser.add_argument("--modular-count", type=int, default=1000,
+                        help="число показателей в замере модульного возведения в степень")
+    parser.add_argument("--output", default=None, help="куда записать результаты (JSON)")
+    args = parser.parse_args(argv)
+
+    print("Операция и бэкенд, операций в секунду, замедление относительно float:")
+    results = run_benchmarks(count=args.count, repeat=args.repeat)
+    print("\nМодульное возведение в степень, общее основание и модуль (ускорение относительно первого способа):")
+    results += run_modular_benchmarks(count=args.modular_count, repeat=args.repeat)
+    if args.output:
+        save_report(args.output, results)
+        print(f"\n📄 Результаты записаны в {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,18 @@
 # calculator.py
 
+import array
+import ast
+import collections.abc
+import decimal
+import fractions
+import functools
+import itertools
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен: без него работают списки
+    np = None
+
 def add(a, b):
     """
     Adds two numbers.
@@ -71,13 +84,570 @@ def modulo(a, b):
 
 # Исправленная версия
 
-def power(base, exponent):
+def power(base, exponent, mod=None):
     """
-    Raises base to the power of exponent.
-    :param base: float or int
-    :param exponent: float or int
-    :return: float or int (base ** exponent)
+    Raises base to the power of exponent, optionally modulo mod.
+    For integers both forms use square-and-multiply in C (int.__pow__ and
+    three-argument pow), so only O(log exponent) multiplications are made;
+    with mod the intermediate values never grow beyond mod.
+    :param base: float or int (int when mod is given)
+    :param exponent: float or int (int when mod is given; negative means modular inverse)
+    :param mod: int or None
+    :return: float or int (base ** exponent, or base ** exponent % mod)
     """
+    if mod is not None:
+        _check_modular(base, exponent, mod)
+        return pow(base, exponent, mod)
     if exponent == 0:
         return 1  # ✅ Исправлено: теперь возвращает 1
-    return base ** exponent
\ No newline at end of file
+    return base ** exponent
+
+
+def _check_modular(base, exponent, mod):
+    if not all(isinstance(x, int) and not isinstance(x, bool) for x in (base, exponent, mod)):
+        raise TypeError("Modular power requires integer base, exponent and mod.")
+    if mod == 0:
+        raise ZeroDivisionError("Modulo by zero is not allowed.")
+
+
+# Largest window for power_batch tables: the table holds (bits / w) * 2**w residues,
+# so with 2048-bit exponents w=8 keeps it at 65 536 numbers (~20 MB for a 2048-bit mod)
+MAX_POWER_WINDOW = 8
+
+
+def _best_window(bits, count):
+    """
+    Window width minimising the work of power_batch: building the table costs
+    about (bits / w) * 2**w multiplications, each exponent then costs bits / w.
+    The width is capped at MAX_POWER_WINDOW to bound the table's memory.
+    """
+    return min(range(1, MAX_POWER_WINDOW + 1), key=lambda w: -(-bits // w) * ((1 << w) + count))
+
+
+def power_table(base, mod, bits, window=None, count=1):
+    """
+    Precomputes the fixed-base window table: row i holds base ** (j * 2 ** (window * i)) % mod
+    for every window digit j.
+    :param bits: largest exponent bit length the table must cover
+    :param window: bits per digit, 1..MAX_POWER_WINDOW (chosen from bits and count when None)
+    :param count: expected number of exponents, used to choose the window
+    :return: (window, table)
+    """
+    _check_modular(base, bits, mod)
+    if window is None:
+        window = _best_window(max(bits, 1), count)
+    elif not 1 <= window <= MAX_POWER_WINDOW:
+        raise ValueError(f"Window must be between 1 and {MAX_POWER_WINDOW} bits.")
+    size = 1 << window
+    table = []
+    g = base % mod
+    for _ in range(max(-(-bits // window), 1)):
+        row = [1 % mod] * size
+        for j in range(1, size):
+            row[j] = row[j - 1] * g % mod
+        table.append(row)
+        g = row[-1] * g % mod  # base ** (2 ** window) для следующего разряда
+    return window, table
+
+
+def power_batch(base, exponents, mod, window=None):
+    """
+    Computes base ** e % mod for many exponents with the same base and mod.
+    The fixed-base window table is built once; every exponent then needs one
+    multiplication per window digit and no squarings.
+    :param base: int
+    :param exponents: iterable of non-negative ints
+    :param mod: int
+    :param window: bits per table digit, at most MAX_POWER_WINDOW (chosen automatically when None)
+    :return: list of ints
+    """
+    exponents = list(exponents)
+    if not exponents:
+        return []
+    for e in exponents:
+        _check_modular(base, e, mod)
+        if e < 0:
+            raise ValueError("power_batch supports only non-negative exponents.")
+    bits = max(e.bit_length() for e in exponents)
+    window, table = power_table(base, mod, bits, window, len(exponents))
+    mask = (1 << window) - 1
+    one = 1 % mod
+    results = []
+    for e in exponents:
+        result = one
+        for row in table:
+            if not e:
+                break
+            digit = e & mask
+            if digit:
+                result = result * row[digit] % mod
+            e >>= window
+        results.append(result)
+    return results
+
+
+# === Expression compiler: parse once, evaluate many times ===
+
+_BINARY_OPERATIONS = {
+    ast.Add: "add",
+    ast.Sub: "subtract",
+    ast.Mult: "multiply",
+    ast.Div: "divide",
+    ast.Mod: "modulo",
+    ast.Pow: "power",
+}
+
+
+class _ExpressionTranslator(ast.NodeTransformer):
+    """
+    Rewrites an arithmetic expression into nested calls of the calculator
+    primitives: "x * 2 + 1" becomes add(multiply(x, 2), 1).
+    Anything else (attributes, calls, comparisons, ...) is rejected.
+    """
+
+    def __init__(self):
+        self.variables = []
+
+    def visit_Expression(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_BinOp(self, node):
+        name = _BINARY_OPERATIONS.get(type(node.op))
+        if name is None:
+            raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+        args = [self.visit(node.left), self.visit(node.right)]
+        return ast.Call(func=ast.Name(name, ast.Load()), args=args, keywords=[])
+
+    def visit_UnaryOp(self, node):
+        operand = self.visit(node.operand)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        if isinstance(node.op, ast.USub):
+            return ast.Call(func=ast.Name("subtract", ast.Load()),
+                            args=[ast.Constant(0), operand], keywords=[])
+        raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise ValueError(f"Unsupported constant: {node.value!r}")
+        return node
+
+    def visit_Name(self, node):
+        if node.id not in self.variables:
+            self.variables.append(node.id)
+        return node
+
+    def generic_visit(self, node):
+        raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+
+
+class CompiledExpression:
+    """
+    A formula compiled into a Python function built from add/subtract/
+    multiply/divide/modulo/power. Variables are positional parameters in
+    order of first appearance, or can be passed by name.
+    """
+
+    def __init__(self, formula):
+        try:
+            tree = ast.parse(formula.strip(), mode="eval")
+        except SyntaxError as e:
+            raise ValueError(f"Invalid expression: {formula!r}") from e
+        translator = _ExpressionTranslator()
+        body = translator.visit(tree).body
+        self.formula = formula
+        self.variables = tuple(translator.variables)
+        for name in self.variables:
+            if name in _BINARY_OPERATIONS.values():
+                raise ValueError(f"Variable name clashes with a primitive: {name}")
+        function = ast.Expression(ast.Lambda(
+            args=ast.arguments(posonlyargs=[], args=[ast.arg(name) for name in self.variables],
+                               kwonlyargs=[], kw_defaults=[], defaults=[]),
+            body=body,
+        ))
+        ast.fix_missing_locations(function)
+        # Names of the primitives are resolved in this module, so the
+        # compiled function always calls the current add/divide/...
+        self.function = eval(compile(function, f"<expression {formula!r}>", "eval"), globals())
+
+    def __call__(self, *args, **kwargs):
+        """
+        Evaluates the expression.
+        :param args: variable values in order of self.variables
+        :param kwargs: variable values by name
+        :return: float or int
+        """
+        return self.function(*args, **kwargs)
+
+    def evaluate_many(self, bindings):
+        """
+        Evaluates the expression for many variable bindings without re-parsing.
+        :param bindings: iterable of mappings (name -> value) or sequences of values
+        :return: list of results
+        """
+        function = self.function
+        return [function(**binding) if isinstance(binding, collections.abc.Mapping)
+                else function(*binding) for binding in bindings]
+
+    def __repr__(self):
+        return f"CompiledExpression({self.formula!r}, variables={self.variables})"
+
+
+@functools.lru_cache(maxsize=256)
+def compile_expression(formula):
+    """
+    Compiles a formula string once; repeated calls return the cached result.
+    :param formula: arithmetic expression, e.g. "(a + b) * c ** 2"
+    :return: CompiledExpression
+    """
+    return CompiledExpression(formula)
+
+
+def evaluate(formula, **variables):
+    """
+    Evaluates a formula with the given variables, using the compiled cache.
+    :param formula: arithmetic expression
+    :return: float or int
+    """
+    return compile_expression(formula)(**variables)
+
+
+# === Numeric backends: float, decimal.Decimal, fractions.Fraction ===
+
+class FloatCalculator:
+    """The default float/int arithmetic: the module-level functions."""
+
+    name = "float"
+
+    add = staticmethod(add)
+    subtract = staticmethod(subtract)
+    multiply = staticmethod(multiply)
+    divide = staticmethod(divide)
+    modulo = staticmethod(modulo)
+    power = staticmethod(power)
+
+
+class DecimalCalculator:
+    """
+    Arithmetic on decimal.Decimal in a configurable context.
+    divide is not rounded to 10 places: precision comes from the context.
+    modulo follows the float convention (the result has the sign of b).
+    """
+
+    name = "decimal"
+
+    def __init__(self, context=None):
+        """
+        :param context: decimal.Context (precision, rounding); default is a copy
+                        of the current context
+        """
+        self.context = context if context is not None else decimal.getcontext().copy()
+
+    def convert(self, value):
+        """
+        Converts a number to Decimal; floats are taken by their shortest repr (0.1 → Decimal("0.1")).
+        :param value: int, float, Decimal or Fraction
+        :return: Decimal
+        """
+        if isinstance(value, decimal.Decimal):
+            return value
+        if isinstance(value, float):
+            return self.context.create_decimal(repr(value))
+        if isinstance(value, fractions.Fraction):
+            return self.context.divide(decimal.Decimal(value.numerator), decimal.Decimal(value.denominator))
+        return self.context.create_decimal(value)
+
+    def add(self, a, b):
+        return self.context.add(self.convert(a), self.convert(b))
+
+    def subtract(self, a, b):
+        return self.context.subtract(self.convert(a), self.convert(b))
+
+    def multiply(self, a, b):
+        return self.context.multiply(self.convert(a), self.convert(b))
+
+    def divide(self, a, b):
+        b = self.convert(b)
+        if b == 0:
+            raise ZeroDivisionError("Division by zero is not allowed.")
+        return self.context.divide(self.convert(a), b)
+
+    def modulo(self, a, b):
+        b = self.convert(b)
+        if b == 0:
+            raise ZeroDivisionError("Modulo by zero is not allowed.")
+        result = self.context.remainder(self.convert(a), b)
+        if result and (result < 0) != (b < 0):
+            result = self.context.add(result, b)
+        return result
+
+    def power(self, base, exponent):
+        if exponent == 0:
+            return decimal.Decimal(1)
+        if base == 0 and exponent < 0:
+            # decimal вернул бы Infinity; float и Fraction здесь бросают ZeroDivisionError
+            raise ZeroDivisionError("Zero cannot be raised to a negative power.")
+        try:
+            return self.context.power(self.convert(base), self.convert(exponent))
+        except decimal.InvalidOperation as e:
+            raise ValueError(f"Power is undefined: {base} ** {exponent}") from e
+
+
+class FractionCalculator:
+    """
+    Exact rational arithmetic on fractions.Fraction.
+    power accepts only integer exponents: other results are irrational.
+    """
+
+    name = "fraction"
+
+    @staticmethod
+    def convert(value):
+        """
+        Converts a number to Fraction; floats are taken by their shortest repr (0.1 → 1/10).
+        :param value: int, float, Decimal or Fraction
+        :return: Fraction
+        """
+        if isinstance(value, fractions.Fraction):
+            return value
+        if isinstance(value, float):
+            return fractions.Fraction(repr(value))
+        return fractions.Fraction(value)
+
+    def add(self, a, b):
+        return self.convert(a) + self.convert(b)
+
+    def subtract(self, a, b):
+        return self.convert(a) - self.convert(b)
+
+    def multiply(self, a, b):
+        return self.convert(a) * self.convert(b)
+
+    def divide(self, a, b):
+        if b == 0:
+            raise ZeroDivisionError("Division by zero is not allowed.")
+        return self.convert(a) / self.convert(b)
+
+    def modulo(self, a, b):
+        if b == 0:
+            raise ZeroDivisionError("Modulo by zero is not allowed.")
+        return self.convert(a) % self.convert(b)
+
+    def power(self, base, exponent):
+        exponent = self.convert(exponent)
+        if exponent.denominator != 1:
+            raise ValueError("Fraction backend supports only integer exponents.")
+        if exponent == 0:
+            return fractions.Fraction(1)
+        return self.convert(base) ** exponent.numerator
+
+
+BACKENDS = {
+    "float": FloatCalculator,
+    "decimal": DecimalCalculator,
+    "fraction": FractionCalculator,
+}
+
+
+def get_calculator(backend="float", **options):
+    """
+    Returns an object with the add/subtract/multiply/divide/modulo/power API
+    working on the selected number type.
+    :param backend: "float", "decimal" or "fraction"
+    :param options: backend options, e.g. context=decimal.Context(prec=50) for "decimal"
+    :return: calculator object
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}. Available: {', '.join(BACKENDS)}")
+    return BACKENDS[backend](**options)
+
+
+# === Element-wise arithmetic with NumPy-style broadcasting ===
+
+class ZeroDivisorError(ZeroDivisionError):
+    """A zero divisor in element-wise divide/modulo; .index is its position in the result."""
+
+    def __init__(self, message, index):
+        self.index = index
+        super().__init__(f"{message} First zero divisor at index {index}.")
+
+
+def _is_numpy(x):
+    return np is not None and isinstance(x, np.ndarray)
+
+
+_SEQUENCE_TYPES = (list, tuple, array.array)
+
+
+def _shape(x):
+    """
+    Shape of a scalar (()), a flat sequence or nested lists of equal length.
+    The shape is read from the first element at each level; _check_shape verifies the rest.
+    """
+    shape = []
+    while isinstance(x, _SEQUENCE_TYPES):
+        shape.append(len(x))
+        if not x:
+            break
+        x = x[0]
+    return tuple(shape)
+
+
+def _check_shape(x, shape):
+    """Raises ValueError for ragged input: every row must match shape, like numpy.asarray."""
+    if not shape:
+        if isinstance(x, _SEQUENCE_TYPES):
+            raise ValueError("Inhomogeneous nested sequence: rows have different depths.")
+        return
+    if not isinstance(x, _SEQUENCE_TYPES) or len(x) != shape[0]:
+        raise ValueError(f"Inhomogeneous nested sequence: expected a row of length {shape[0]}, "
+                         f"got {len(x) if isinstance(x, _SEQUENCE_TYPES) else 'a scalar'}.")
+    if len(shape) > 1:
+        for item in x:
+            _check_shape(item, shape[1:])
+    elif not isinstance(x, array.array) and any(isinstance(item, _SEQUENCE_TYPES) for item in x):
+        raise ValueError("Inhomogeneous nested sequence: rows have different depths.")
+
+
+def _broadcast_shapes(a_shape, b_shape):
+    """NumPy broadcasting rule: trailing dimensions must be equal or 1."""
+    ndim = max(len(a_shape), len(b_shape))
+    a_shape = (1,) * (ndim - len(a_shape)) + a_shape
+    b_shape = (1,) * (ndim - len(b_shape)) + b_shape
+    shape = []
+    for x, y in zip(a_shape, b_shape):
+        if x != y and 1 not in (x, y):
+            raise ValueError(f"Shapes cannot be broadcast together: {a_shape} and {b_shape}")
+        shape.append(y if x == 1 else x)
+    return tuple(shape)
+
+
+def _broadcast_items(x, pad, n):
+    """Items of x along the current result dimension of length n."""
+    if pad:
+        return itertools.repeat(x, n)
+    if len(x) == 1 and n != 1:
+        return itertools.repeat(x[0], n)
+    return x
+
+
+def _apply_broadcast(func, a, b, a_pad, b_pad, shape):
+    if not shape:
+        return func(a, b)
+    n, rest = shape[0], shape[1:]
+    a_items = _broadcast_items(a, a_pad, n)
+    b_items = _broadcast_items(b, b_pad, n)
+    a_next, b_next = max(a_pad - 1, 0), max(b_pad - 1, 0)
+    if not rest:
+        return list(map(func, a_items, b_items))
+    return [_apply_broadcast(func, x, y, a_next, b_next, rest) for x, y in zip(a_items, b_items)]
+
+
+def _first_zero(b, b_shape, shape):
+    """
+    Position in the result of the first zero divisor, or None.
+    Checks b itself once (not the broadcast result): broadcasting keeps row-major
+    order, so the first zero of b gives the first zero of the result, with
+    broadcast dimensions at 0.
+    """
+    if _is_numpy(b):
+        zeros = np.flatnonzero(b == 0)
+        if not zeros.size:
+            return None
+        position = tuple(int(i) for i in np.unravel_index(zeros[0], b_shape)) if b_shape else ()
+    else:
+        position = _first_zero_in_lists(b)
+        if position is None:
+            return None
+    pad = len(shape) - len(b_shape)
+    index = (0,) * pad + tuple(0 if size == 1 else i for i, size in zip(position, b_shape))
+    return index[0] if len(index) == 1 else index
+
+
+def _first_zero_in_lists(b):
+    if not isinstance(b, (list, tuple, array.array)):
+        return () if b == 0 else None
+    for i, item in enumerate(b):
+        if isinstance(item, (list, tuple, array.array)):
+            inner = _first_zero_in_lists(item)
+            if inner is not None:
+                return (i,) + inner
+        elif item == 0:
+            return (i,)
+    return None
+
+
+def _elementwise(func, numpy_func, a, b, zero_message=None):
+    if _is_numpy(a) or _is_numpy(b):
+        a, b = np.asarray(a), np.asarray(b)
+        shape = np.broadcast_shapes(a.shape, b.shape)
+        if zero_message is not None:
+            index = _first_zero(b, b.shape, shape)
+            if index is not None:
+                raise ZeroDivisorError(zero_message, index)
+        return numpy_func(a, b)
+    a_shape, b_shape = _shape(a), _shape(b)
+    _check_shape(a, a_shape)
+    _check_shape(b, b_shape)
+    shape = _broadcast_shapes(a_shape, b_shape)
+    if zero_message is not None:
+        index = _first_zero(b, b_shape, shape)
+        if index is not None:
+            raise ZeroDivisorError(zero_message, index)
+    return _apply_broadcast(func, a, b, len(shape) - len(a_shape), len(shape) - len(b_shape), shape)
+
+
+def add_batch(a, b):
+    """
+    Element-wise add with NumPy-style broadcasting.
+    :param a: number, list (possibly nested) or numpy.ndarray
+    :param b: number, list (possibly nested) or numpy.ndarray
+    :return: list for list inputs, numpy.ndarray if any input is an ndarray
+    """
+    return _elementwise(add, lambda x, y: x + y, a, b)
+
+
+def subtract_batch(a, b):
+    """
+    Element-wise subtract with NumPy-style broadcasting.
+    :param a: number, list (possibly nested) or numpy.ndarray
+    :param b: number, list (possibly nested) or numpy.ndarray
+    :return: list for list inputs, numpy.ndarray if any input is an ndarray
+    """
+    return _elementwise(subtract, lambda x, y: x - y, a, b)
+
+
+def multiply_batch(a, b):
+    """
+    Element-wise multiply with NumPy-style broadcasting.
+    :param a: number, list (possibly nested) or numpy.ndarray
+    :param b: number, list (possibly nested) or numpy.ndarray
+    :return: list for list inputs, numpy.ndarray if any input is an ndarray
+    """
+    return _elementwise(multiply, lambda x, y: x * y, a, b)
+
+
+def divide_batch(a, b):
+    """
+    Element-wise divide with NumPy-style broadcasting, rounded to 10 places like divide.
+    All divisors are checked before any division.
+    :param a: number, list (possibly nested) or numpy.ndarray
+    :param b: number, list (possibly nested) or numpy.ndarray
+    :return: list for list inputs, numpy.ndarray if any input is an ndarray
+    :raises ZeroDivisorError: with the result index of the first zero divisor
+    """
+    return _elementwise(divide, lambda x, y: np.round(x / y, 10), a, b,
+                        "Division by zero is not allowed.")
+
+
+def modulo_batch(a, b):
+    """
+    Element-wise modulo with NumPy-style broadcasting.
+    All divisors are checked before any operation.
+    :param a: number, list (possibly nested) or numpy.ndarray
+    :param b: number, list (possibly nested) or numpy.ndarray
+    :return: list for list inputs, numpy.ndarray if any input is an ndarray
+    :raises ZeroDivisorError: with the result index of the first zero divisor
+    """
+    return _elementwise(modulo, lambda x, y: x % y, a, b, "Modulo by zero is not allowed.")
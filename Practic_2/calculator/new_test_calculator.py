@@ -66,10 +66,231 @@ def test_modulo():
     print("✅ test_modulo passed")
 
 
+def test_compile_expression():
+    expression = compile_expression("(a + b) * c ** 2 - a / 4 % 3")
+    assert expression.variables == ("a", "b", "c")
+    assert expression(8, 2, 3) == (8 + 2) * 3 ** 2 - 8 / 4 % 3
+    assert expression(a=8, b=2, c=3) == expression(8, 2, 3)
+    assert compile_expression("(a + b) * c ** 2 - a / 4 % 3") is expression  # кэш
+    assert compile_expression("-x + +2")(5) == -3
+    assert compile_expression("x ** 0")(0) == 1
+    assert evaluate("x / 3", x=1) == divide(1, 3)
+    print("✅ test_compile_expression passed")
+
+def test_expression_evaluate_many():
+    expression = compile_expression("x * y + 1")
+    rows = [(i, i + 1) for i in range(100)]
+    assert expression.evaluate_many(rows) == [x * y + 1 for x, y in rows]
+    assert expression.evaluate_many([{"x": 2, "y": 5}]) == [11]
+    try:
+        compile_expression("x / y")(1, 0)
+    except ZeroDivisionError:
+        pass
+    else:
+        assert False, "Expected ZeroDivisionError"
+    print("✅ test_expression_evaluate_many passed")
+
+def test_expression_rejects_unsupported():
+    for formula in ("x // 2", "__import__('os')", "x.real", "x < 1", "'a' + 'b'", "add + 1", "1 +"):
+        try:
+            compile_expression(formula)
+        except ValueError:
+            pass
+        else:
+            assert False, f"Expected ValueError for {formula!r}"
+    print("✅ test_expression_rejects_unsupported passed")
+
+
+def test_decimal_backend():
+    from decimal import Context, Decimal
+    calc = get_calculator("decimal", context=Context(prec=50))
+    assert calc.add(0.1, 0.2) == Decimal("0.3")
+    assert calc.divide(1, 3) == Context(prec=50).divide(Decimal(1), Decimal(3))
+    assert len(str(calc.divide(1, 3))) == 52  # "0." и 50 знаков — без округления до 10
+    assert calc.power(2, 100) == Decimal(2 ** 100)
+    assert calc.power(0, 0) == 1
+    assert calc.modulo(-7, 3) == Decimal(2)  # знак делителя, как у float
+    assert calc.modulo(7, -3) == Decimal(-2)
+    for func in (calc.divide, calc.modulo):
+        try:
+            func(1, 0)
+        except ZeroDivisionError:
+            pass
+        else:
+            assert False, "Expected ZeroDivisionError"
+    # 0 в отрицательной степени — ZeroDivisionError во всех бэкендах, а не Infinity
+    for backend in BACKENDS:
+        try:
+            get_calculator(backend).power(0, -1)
+        except ZeroDivisionError:
+            pass
+        else:
+            assert False, f"Expected ZeroDivisionError from {backend} backend"
+    print("✅ test_decimal_backend passed")
+
+def test_fraction_backend():
+    from fractions import Fraction
+    calc = get_calculator("fraction")
+    assert calc.add(0.1, 0.2) == Fraction(3, 10)
+    assert calc.divide(1, 3) == Fraction(1, 3)
+    assert calc.multiply(calc.divide(1, 3), 3) == 1
+    assert calc.power(Fraction(2, 3), -2) == Fraction(9, 4)
+    assert calc.power(5, 0) == 1
+    assert calc.modulo(-7, 3) == -7 % 3
+    try:
+        calc.power(2, 0.5)
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+    assert get_calculator("float").divide(1, 3) == divide(1, 3)
+    try:
+        get_calculator("complex")
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+    print("✅ test_fraction_backend passed")
+
+
+def test_modular_power():
+    assert power(3, 4, 5) == 81 % 5
+    assert power(2, 10, 1000) == 24
+    assert power(7, 0, 13) == 1
+    assert power(7, 0, 1) == 0
+    assert power(3, -1, 7) == 5  # обратный элемент: 3 * 5 % 7 == 1
+    assert power(2, 3) == 8  # без модуля — как раньше
+    for args, error in (((2, 3, 0), ZeroDivisionError), ((2.0, 3, 5), TypeError), ((2, 0.5, 5), TypeError)):
+        try:
+            power(*args)
+        except error:
+            pass
+        else:
+            assert False, f"Expected {error.__name__} for power{args}"
+    print("✅ test_modular_power passed")
+
+def test_power_batch():
+    import random
+    rng = random.Random(1)
+    mod = rng.getrandbits(300) | 1
+    base = rng.getrandbits(280)
+    exponents = [0, 1, 2, 255, 256] + [rng.getrandbits(300) for _ in range(50)]
+    expected = [pow(base, e, mod) for e in exponents]
+    assert power_batch(base, exponents, mod) == expected
+    for window in (1, 3, 8):
+        assert power_batch(base, exponents, mod, window=window) == expected
+    assert power_batch(base, [], mod) == []
+    assert power_batch(5, [3, 4], 1) == [0, 0]
+    try:
+        power_batch(2, [1, -1], 7)
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+    try:
+        power_batch(2, [1], 7, window=MAX_POWER_WINDOW + 1)
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+    print("✅ test_power_batch passed")
+
+def test_power_window_bounded():
+    # Много длинных показателей не должны раздувать таблицу: окно ограничено
+    from calculator import _best_window
+    for bits in (12, 256, 2048):
+        for count in (1, 10 ** 5, 10 ** 6, 10 ** 9):
+            assert 1 <= _best_window(bits, count) <= MAX_POWER_WINDOW
+    window, table = power_table(3, (1 << 2048) - 1, 2048, count=10 ** 6)
+    assert window == MAX_POWER_WINDOW
+    assert sum(map(len, table)) <= -(-2048 // MAX_POWER_WINDOW) << MAX_POWER_WINDOW
+    print("✅ test_power_window_bounded passed")
+
+
+def test_elementwise_broadcasting():
+    assert add_batch([1, 2, 3], 10) == [11, 12, 13]
+    assert subtract_batch(10, [1, 2]) == [9, 8]
+    assert multiply_batch([[1], [2]], [1, 10, 100]) == [[1, 10, 100], [2, 20, 200]]
+    assert divide_batch([1, 2], [3, 4]) == [divide(1, 3), divide(2, 4)]
+    assert modulo_batch([-7, 7], 3) == [-7 % 3, 7 % 3]
+    assert add_batch([], 5) == []
+    try:
+        add_batch([1, 2], [1, 2, 3])
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+    print("✅ test_elementwise_broadcasting passed")
+
+def test_elementwise_ragged():
+    # Рваные вложенные списки — ValueError, как в NumPy, а не молчаливое растяжение
+    for a, b in (([[1, 2], [3]], [[1, 2], [3, 4]]),
+                 ([[1, 2], [3, 4]], [[1, 2], [3, 4, 5]]),
+                 ([[1, 2], 3], 1),
+                 ([1, [2]], 1),
+                 ([[], [1]], 0)):
+        try:
+            add_batch(a, b)
+        except ValueError:
+            pass
+        else:
+            assert False, f"Expected ValueError for {a!r} + {b!r}"
+    assert add_batch([[1, 2], [3, 4]], [[10], [20]]) == [[11, 12], [23, 24]]
+    assert add_batch([[], []], 1) == [[], []]
+    print("✅ test_elementwise_ragged passed")
+
+def test_elementwise_zero_divisor_index():
+    for func in (divide_batch, modulo_batch):
+        try:
+            func([1, 2, 3, 4], [1, 2, 0, 0])
+        except ZeroDivisionError as e:
+            assert e.index == 2
+        else:
+            assert False, "Expected ZeroDivisionError"
+    try:
+        divide_batch([[1, 2], [3, 4]], [[1], [0]])  # делитель растянут по столбцам
+    except ZeroDivisorError as e:
+        assert e.index == (1, 0)
+        assert "(1, 0)" in str(e)
+    else:
+        assert False, "Expected ZeroDivisorError"
+    print("✅ test_elementwise_zero_divisor_index passed")
+
+def test_elementwise_numpy():
+    try:
+        import numpy as np
+    except ImportError:
+        print("⏭️  test_elementwise_numpy skipped: NumPy не установлен")
+        return
+    result = add_batch(np.array([[1.0], [2.0]]), np.array([10.0, 20.0]))
+    assert isinstance(result, np.ndarray)
+    assert result.tolist() == [[11.0, 21.0], [12.0, 22.0]]
+    assert divide_batch(np.array([1.0, 2.0]), 3).tolist() == [divide(1, 3), divide(2, 3)]
+    try:
+        modulo_batch(np.arange(6).reshape(2, 3), np.array([1, 0, 2]))
+    except ZeroDivisorError as e:
+        assert e.index == (0, 1)
+    else:
+        assert False, "Expected ZeroDivisorError"
+    print("✅ test_elementwise_numpy passed")
+
+
 if __name__ == "__main__":
     test_add()
     test_subtract()
     test_multiply()
     test_divide()
     test_power()
-    test_modulo()
\ No newline at end of file
+    test_modulo()
+    test_compile_expression()
+    test_expression_evaluate_many()
+    test_expression_rejects_unsupported()
+    test_decimal_backend()
+    test_fraction_backend()
+    test_modular_power()
+    test_power_batch()
+    test_power_window_bounded()
+    test_elementwise_broadcasting()
+    test_elementwise_ragged()
+    test_elementwise_zero_divisor_index()
+    test_elementwise_numpy()
\ No newline at end of file
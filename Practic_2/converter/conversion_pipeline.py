@@ -0,0 +1,256 @@
+# conversion_pipeline.py
+#
+# Потоковая конвертация столбцов файлов данных с помощью converter.py.
+# Файл читается и записывается частями по chunk_size строк, поэтому
+# память ограничена одной частью, а не размером файла.
+# Поддерживаются CSV и, если установлен pyarrow, Parquet.
+# Пример:
+#   python conversion_pipeline.py readings.csv out.csv --column temp:F:C --column distance:mi:km
+#   python conversion_pipeline.py readings.parquet out.parquet --column temp:F:K --verify
+
+import argparse
+import collections
+import contextlib
+import csv
+import itertools
+import math
+import os
+import sys
+import tempfile
+
+import converter
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow необязателен: без него доступен только CSV
+    pa = pq = None
+
+
+DEFAULT_CHUNK_SIZE = 65536
+
+# Конвертация одного столбца: имя столбца, исходная и целевая единицы
+ColumnConversion = collections.namedtuple("ColumnConversion", "column from_unit to_unit")
+
+# Поштучные функции converter.py — эталон для проверки пакетной конвертации
+# (единицы берутся из converter.FUNCTION_UNITS — единственного места, где они заданы)
+REFERENCE_FUNCTIONS = {units: function for function, units in converter.FUNCTION_UNITS.items()}
+
+
+def parse_column_spec(spec):
+    """
+    Разбирает описание конвертации вида "столбец:из:в", например "temp:F:C".
+    :return: ColumnConversion
+    """
+    parts = spec.rsplit(":", 2)
+    if len(parts) != 3 or not all(parts):
+        raise ValueError(f"Ожидается столбец:из:в, получено: {spec!r}")
+    conversion = ColumnConversion(*parts)
+    converter.convert_batch([], conversion.from_unit, conversion.to_unit)  # проверка пары единиц
+    return conversion
+
+
+def reference_function(conversion):
+    """Поштучная функция converter.py для пары единиц (или convert, если отдельной функции нет)."""
+    key = conversion.from_unit, conversion.to_unit
+    if key in REFERENCE_FUNCTIONS:
+        return REFERENCE_FUNCTIONS[key]
+    return lambda value: converter.convert(value, *key)
+
+
+def verify_chunk(values, converted, conversion, offset=0):
+    """
+    Сверяет пакетный результат с поштучными функциями.
+    Пропуски (None или NaN на месте null из Parquet) не сверяются.
+    :raises ValueError: при расхождении, с номером строки
+    """
+    reference = reference_function(conversion)
+    for index, (value, result) in enumerate(zip(values, converted)):
+        if value is None or math.isnan(value):
+            continue
+        expected = reference(value)
+        if not math.isclose(result, expected, rel_tol=1e-9, abs_tol=1e-9):
+            raise ValueError(f"Столбец {conversion.column}, строка {offset + index}: "
+                             f"{result!r} вместо {expected!r}")
+
+
+def convert_chunk(values, conversion, offset=0, verify=False):
+    """
+    Конвертирует часть столбца.
+    :param offset: номер первой строки части в файле (для сообщений об ошибках)
+    :raises converter.NegativeValueError: с номерами строк в файле
+    """
+    try:
+        converted = converter.convert_batch(values, conversion.from_unit, conversion.to_unit)
+    except converter.NegativeValueError as e:
+        raise converter.NegativeValueError(
+            f"Столбец {conversion.column}: {e.message}",
+            [offset + index for index in e.indices]) from None
+    if verify:
+        verify_chunk(values, converted, conversion, offset)
+    return converted
+
+
+@contextlib.contextmanager
+def _atomic_destination(destination):
+    """
+    Путь временного файла рядом с destination. Он заменяет destination
+    только при успешном завершении блока; при ошибке удаляется, и
+    destination остаётся прежним (или не появляется).
+    """
+    directory = os.path.dirname(os.path.abspath(destination))
+    fd, temporary = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(destination)}.",
+                                     suffix=".tmp")
+    os.close(fd)
+    umask = os.umask(0)
+    os.umask(umask)
+    os.chmod(temporary, 0o666 & ~umask)  # права как у обычного open(), а не 0600 от mkstemp
+    try:
+        yield temporary
+        os.replace(temporary, destination)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+# === CSV ===
+
+def _column_positions(header, conversions):
+    positions = []
+    for conversion in conversions:
+        if conversion.column not in header:
+            raise ValueError(f"В файле нет столбца {conversion.column!r}")
+        positions.append((header.index(conversion.column), conversion))
+    return positions
+
+
+def _parse_column(rows, position, conversion, offset):
+    try:
+        return [float(row[position]) for row in rows]
+    except (ValueError, IndexError):
+        for index, row in enumerate(rows):
+            try:
+                float(row[position])
+            except (ValueError, IndexError):
+                raise ValueError(f"Столбец {conversion.column}, строка {offset + index}: "
+                                 f"не число") from None
+        raise
+
+
+def convert_csv(source, destination, conversions, chunk_size=DEFAULT_CHUNK_SIZE, verify=False):
+    """
+    Конвертирует столбцы CSV-файла по частям.
+    Результат записывается во временный файл и заменяет destination
+    только после успешной обработки всего файла.
+    :param conversions: список ColumnConversion
+    :return: число обработанных строк данных
+    """
+    with _atomic_destination(destination) as temporary, \
+            open(source, newline="", encoding="utf-8") as fin, \
+            open(temporary, "w", newline="", encoding="utf-8") as fout:
+        reader = csv.reader(fin)
+        writer = csv.writer(fout)
+        header = next(reader, None)
+        if header is None:
+            return 0
+        positions = _column_positions(header, conversions)
+        writer.writerow(header)
+        done = 0
+        while True:
+            rows = list(itertools.islice(reader, chunk_size))
+            if not rows:
+                break
+            for position, conversion in positions:
+                values = _parse_column(rows, position, conversion, done)
+                converted = convert_chunk(values, conversion, done, verify)
+                for row, value in zip(rows, converted):
+                    row[position] = repr(value)
+            writer.writerows(rows)
+            done += len(rows)
+    return done
+
+
+# === Parquet (pyarrow) ===
+
+def convert_parquet(source, destination, conversions, chunk_size=DEFAULT_CHUNK_SIZE, verify=False):
+    """
+    Конвертирует столбцы Parquet-файла по группам строк. Числовой столбец без
+    пропусков передаётся в NumPy без копирования буфера; преобразуется он
+    одной векторной операцией. Пропуски (null) остаются пропусками.
+    Как и в convert_csv, destination заменяется только при успехе.
+    :return: число обработанных строк
+    """
+    if pq is None:
+        raise ImportError("Для Parquet нужен pyarrow: pip install pyarrow")
+    parquet = pq.ParquetFile(source)
+    names = parquet.schema_arrow.names
+    positions = _column_positions(names, conversions)
+    with _atomic_destination(destination) as temporary:
+        return _convert_parquet_batches(parquet, temporary, names, positions, chunk_size, verify)
+
+
+def _convert_parquet_batches(parquet, destination, names, positions, chunk_size, verify):
+    writer = None
+    done = 0
+    try:
+        for batch in parquet.iter_batches(batch_size=chunk_size):
+            columns = list(batch.columns)
+            for position, conversion in positions:
+                column = columns[position]
+                # null превращается в NaN, который проходит конвертацию как есть;
+                # маска валидности возвращает пропуски в выходной столбец
+                values = column.to_numpy(zero_copy_only=False)
+                converted = convert_chunk(values, conversion, done, verify)
+                mask = column.is_null().to_numpy(zero_copy_only=False) if column.null_count else None
+                columns[position] = pa.array(converted, mask=mask)
+            converted = pa.RecordBatch.from_arrays(columns, names=names)
+            if writer is None:
+                writer = pq.ParquetWriter(destination, converted.schema)
+            writer.write_batch(converted)
+            done += batch.num_rows
+        if writer is None:  # в файле нет строк — записываем пустую таблицу с той же схемой
+            pq.write_table(parquet.schema_arrow.empty_table(), destination)
+    finally:
+        if writer is not None:
+            writer.close()
+    return done
+
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+def convert_file(source, destination, conversions, chunk_size=DEFAULT_CHUNK_SIZE, verify=False):
+    """Выбирает формат по расширению: .parquet/.pq — Parquet, остальное — CSV."""
+    if _is_parquet(source) != _is_parquet(destination):
+        raise ValueError("Входной и выходной файлы должны быть одного формата")
+    if _is_parquet(source):
+        return convert_parquet(source, destination, conversions, chunk_size, verify)
+    return convert_csv(source, destination, conversions, chunk_size, verify)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Потоковая конвертация столбцов CSV/Parquet")
+    parser.add_argument("source", help="входной файл (.csv или .parquet)")
+    parser.add_argument("destination", help="выходной файл того же формата")
+    parser.add_argument("--column", action="append", required=True,
+                        help="конвертация столбца вида столбец:из:в, например temp:F:C "
+                             "(можно указать несколько раз)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="число строк в одной части")
+    parser.add_argument("--verify", action="store_true",
+                        help="сверять результат с поштучными функциями converter.py")
+    args = parser.parse_args(argv)
+
+    try:
+        conversions = [parse_column_spec(spec) for spec in args.column]
+        rows = convert_file(args.source, args.destination, conversions, args.chunk_size, args.verify)
+    except (ValueError, ImportError) as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ Обработано строк: {rows}, результат записан в {args.destination}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
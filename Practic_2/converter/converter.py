@@ -7,8 +7,22 @@
 - meters_to_kilometers
 - kilograms_to_grams
 - miles_to_kilometers (с преднамеренной ошибкой)
+- пакетные версии *_batch для списков, array.array и массивов NumPy
+- convert(value, from_unit, to_unit) по реестру единиц измерения
+- compose(...) — цепочка конвертаций, свёрнутая в одну функцию a*x + b
 """
 
+import array
+import collections
+import fractions
+import itertools
+import operator
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен: без него пакеты обрабатываются через array.array
+    np = None
+
 def celsius_to_fahrenheit(celsius):
     """
     Конвертирует температуру из градусов Цельсия в Фаренгейты.
@@ -73,3 +87,320 @@ def miles_to_kilometers(miles):
     if miles < 0:
        raise ValueError("Расстояние не может быть отрицательным.")
     return miles * 1.60934  # Исправлено!
+
+
+# === Пакетная конвертация ===
+
+class NegativeValueError(ValueError):
+    """
+    Отрицательные значения в пакете. В отличие от проверки по одному значению,
+    сообщает сразу все индексы с ошибкой.
+    """
+
+    def __init__(self, message, indices):
+        self.message = message
+        self.indices = list(indices)
+        shown = ", ".join(map(str, self.indices[:10]))
+        more = f" и ещё {len(self.indices) - 10}" if len(self.indices) > 10 else ""
+        super().__init__(f"{message} Индексы: {shown}{more}.")
+
+
+def _as_batch(values):
+    """
+    Пакет значений в компактном виде: numpy.ndarray остаётся массивом NumPy
+    (float64), остальные входы (списки, кортежи, array.array, memoryview)
+    упаковываются в array.array("d").
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        return np.asarray(values, dtype=float)
+    return array.array("d", values)
+
+
+def _map_batch(values, formula):
+    """Применяет формулу ко всему пакету: массиву NumPy — одной операцией, иначе поэлементно."""
+    if np is not None and isinstance(values, np.ndarray):
+        return formula(values)
+    return array.array("d", map(formula, values))
+
+
+def _check_non_negative(values, message):
+    """
+    Проверяет весь пакет за один проход и сообщает индексы всех отрицательных значений.
+    :raises NegativeValueError: если отрицательные значения есть
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        indices = np.flatnonzero(values < 0).tolist()
+    else:
+        # compress и map выполняют цикл на уровне C, без байт-кода на каждый элемент
+        indices = list(itertools.compress(itertools.count(),
+                                          map(operator.lt, values, itertools.repeat(0))))
+    if indices:
+        raise NegativeValueError(message, indices)
+
+
+def celsius_to_fahrenheit_batch(celsius):
+    """
+    Пакетная версия celsius_to_fahrenheit.
+    :param celsius: список, array.array или numpy.ndarray температур в °C
+    :return: array.array("d") или numpy.ndarray температур в °F
+    """
+    return _map_batch(_as_batch(celsius), lambda c: c * 9/5 + 32)
+
+
+def fahrenheit_to_celsius_batch(fahrenheit):
+    """
+    Пакетная версия fahrenheit_to_celsius.
+    :param fahrenheit: список, array.array или numpy.ndarray температур в °F
+    :return: array.array("d") или numpy.ndarray температур в °C
+    """
+    return _map_batch(_as_batch(fahrenheit), lambda f: (f - 32) * 5/9)
+
+
+def meters_to_kilometers_batch(meters):
+    """
+    Пакетная версия meters_to_kilometers.
+    :param meters: список, array.array или numpy.ndarray расстояний в метрах
+    :return: array.array("d") или numpy.ndarray расстояний в километрах
+    :raises NegativeValueError: с индексами всех отрицательных значений
+    """
+    values = _as_batch(meters)
+    _check_non_negative(values, "Расстояние не может быть отрицательным.")
+    return _map_batch(values, lambda m: m / 1000)
+
+
+def kilograms_to_grams_batch(kilograms):
+    """
+    Пакетная версия kilograms_to_grams.
+    :param kilograms: список, array.array или numpy.ndarray масс в кг
+    :return: array.array("d") или numpy.ndarray масс в граммах
+    :raises NegativeValueError: с индексами всех отрицательных значений
+    """
+    values = _as_batch(kilograms)
+    _check_non_negative(values, "Масса не может быть отрицательной.")
+    return _map_batch(values, lambda kg: kg * 1000)
+
+
+def miles_to_kilometers_batch(miles):
+    """
+    Пакетная версия miles_to_kilometers.
+    :param miles: список, array.array или numpy.ndarray расстояний в милях
+    :return: array.array("d") или numpy.ndarray расстояний в километрах
+    :raises NegativeValueError: с индексами всех отрицательных значений
+    """
+    values = _as_batch(miles)
+    _check_non_negative(values, "Расстояние не может быть отрицательным.")
+    return _map_batch(values, lambda mi: mi * 1.60934)
+
+
+# === Реестр единиц измерения ===
+
+# Единица: имя, величина и аффинное преобразование в базовую единицу величины:
+# base = value * scale + offset
+Unit = collections.namedtuple("Unit", "name dimension scale offset")
+
+# Величины и сообщение об ошибке для отрицательных значений (None — допустимы)
+DIMENSIONS = {
+    "length": "Расстояние не может быть отрицательным.",
+    "mass": "Масса не может быть отрицательной.",
+    "temperature": None,
+}
+
+UNITS = {}
+
+# Предвычисленные преобразования для каждой пары единиц одной величины:
+# (from_unit, to_unit) -> (a, b, сообщение об ошибке для отрицательных), result = value * a + b
+_CONVERSIONS = {}
+
+
+def _exact(number):
+    """Точное рациональное значение; float берётся по десятичной записи (1609.34, а не её двоичное приближение)."""
+    if isinstance(number, float):
+        return fractions.Fraction(repr(number))
+    return fractions.Fraction(number)
+
+
+def register_unit(name, dimension, scale, offset=0, replace=False):
+    """
+    Добавляет единицу в реестр и предвычисляет её преобразования
+    во все единицы той же величины и обратно.
+    :param name: обозначение единицы, например "km"
+    :param dimension: величина из DIMENSIONS
+    :param scale: множитель перевода в базовую единицу величины (число или Fraction)
+    :param offset: сдвиг перевода в базовую единицу (для температур)
+    :param replace: разрешить замену уже зарегистрированной единицы
+    """
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Неизвестная величина: {dimension}")
+    if scale == 0:
+        raise ValueError("Множитель единицы не может быть нулевым.")
+    if name in UNITS:
+        if not replace:
+            raise ValueError(f"Единица уже зарегистрирована: {name}")
+        unregister_unit(name)
+    unit = Unit(name, dimension, _exact(scale), _exact(offset))
+    UNITS[name] = unit
+    message = DIMENSIONS[dimension]
+    for other in UNITS.values():
+        if other.dimension != dimension:
+            continue
+        # value → base → other: (value * s1 + o1 - o2) / s2; коэффициенты считаются
+        # точно в дробях и округляются до float один раз
+        _CONVERSIONS[name, other.name] = (
+            float(unit.scale / other.scale), float((unit.offset - other.offset) / other.scale), message)
+        _CONVERSIONS[other.name, name] = (
+            float(other.scale / unit.scale), float((other.offset - unit.offset) / unit.scale), message)
+    return unit
+
+
+def unregister_unit(name):
+    """Удаляет единицу из реестра вместе со всеми её преобразованиями."""
+    if name not in UNITS:
+        raise ValueError(f"Неизвестная единица измерения: {name}")
+    del UNITS[name]
+    for pair in [pair for pair in _CONVERSIONS if name in pair]:
+        del _CONVERSIONS[pair]
+
+
+def _conversion(from_unit, to_unit):
+    """Предвычисленное преобразование (a, b, сообщение) или ValueError с причиной."""
+    try:
+        return _CONVERSIONS[from_unit, to_unit]
+    except KeyError:
+        for unit in (from_unit, to_unit):
+            if unit not in UNITS:
+                raise ValueError(f"Неизвестная единица измерения: {unit}") from None
+        raise ValueError(f"Нельзя конвертировать {UNITS[from_unit].dimension} "
+                         f"в {UNITS[to_unit].dimension}: {from_unit} → {to_unit}") from None
+
+
+def convert(value, from_unit, to_unit):
+    """
+    Конвертирует значение между любыми единицами одной величины
+    одним умножением и сложением по предвычисленной таблице.
+    :param value: число
+    :param from_unit: исходная единица, например "mi"
+    :param to_unit: целевая единица, например "m"
+    :return: значение в целевой единице
+    """
+    try:
+        a, b, negative_message = _CONVERSIONS[from_unit, to_unit]
+    except KeyError:
+        a, b, negative_message = _conversion(from_unit, to_unit)  # сообщит причину
+    if negative_message is not None and value < 0:
+        raise ValueError(negative_message)
+    return value * a + b
+
+
+def convert_batch(values, from_unit, to_unit):
+    """
+    Пакетная версия convert: одна проверка пары единиц на весь пакет.
+    :param values: список, array.array или numpy.ndarray
+    :return: array.array("d") или numpy.ndarray
+    :raises NegativeValueError: с индексами всех отрицательных значений
+    """
+    a, b, negative_message = _conversion(from_unit, to_unit)
+    values = _as_batch(values)
+    if negative_message is not None:
+        _check_non_negative(values, negative_message)
+    return _map_batch(values, lambda x: x * a + b)
+
+
+# Длина: базовая единица — метр
+register_unit("m", "length", 1)
+register_unit("km", "length", 1000)
+register_unit("cm", "length", 0.01)
+register_unit("mm", "length", 0.001)
+register_unit("mi", "length", 1609.34)  # тот же коэффициент, что в miles_to_kilometers
+register_unit("ft", "length", 0.3048)
+register_unit("in", "length", 0.0254)
+
+# Масса: базовая единица — грамм
+register_unit("g", "mass", 1)
+register_unit("kg", "mass", 1000)
+register_unit("mg", "mass", 0.001)
+register_unit("t", "mass", 1_000_000)
+register_unit("lb", "mass", 453.59237)
+
+# Температура: базовая единица — градус Цельсия
+register_unit("C", "temperature", 1)
+register_unit("F", "temperature", fractions.Fraction(5, 9), fractions.Fraction(-160, 9))
+register_unit("K", "temperature", 1, -273.15)
+
+
+# === Свёрнутые цепочки конвертаций ===
+
+# Поштучные функции как шаги цепочки: функция -> (из, в)
+FUNCTION_UNITS = {
+    celsius_to_fahrenheit: ("C", "F"),
+    fahrenheit_to_celsius: ("F", "C"),
+    meters_to_kilometers: ("m", "km"),
+    kilograms_to_grams: ("kg", "g"),
+    miles_to_kilometers: ("mi", "km"),
+}
+
+
+class AffineConverter:
+    """
+    Конвертация value * scale + offset, свёрнутая из цепочки шагов.
+    Единицы и допустимость отрицательных значений проверены при создании,
+    при вызове остаётся одно умножение и сложение.
+    """
+
+    __slots__ = ("from_unit", "to_unit", "scale", "offset", "negative_message")
+
+    def __init__(self, from_unit, to_unit):
+        self.from_unit = from_unit
+        self.to_unit = to_unit
+        self.scale, self.offset, self.negative_message = _conversion(from_unit, to_unit)
+
+    def __call__(self, value):
+        if self.negative_message is not None and value < 0:
+            raise ValueError(self.negative_message)
+        return value * self.scale + self.offset
+
+    def batch(self, values):
+        """Пакетная версия: список, array.array или numpy.ndarray."""
+        values = _as_batch(values)
+        if self.negative_message is not None:
+            _check_non_negative(values, self.negative_message)
+        a, b = self.scale, self.offset
+        return _map_batch(values, lambda x: x * a + b)
+
+    def __repr__(self):
+        return (f"AffineConverter({self.from_unit} → {self.to_unit}: "
+                f"x * {self.scale!r} + {self.offset!r})")
+
+
+def _step_units(step):
+    if isinstance(step, AffineConverter):
+        return step.from_unit, step.to_unit
+    if step in FUNCTION_UNITS:
+        return FUNCTION_UNITS[step]
+    if isinstance(step, tuple) and len(step) == 2:
+        return step
+    raise TypeError(f"Шаг цепочки должен быть функцией конвертации, AffineConverter "
+                    f"или парой единиц (из, в): {step!r}")
+
+
+def compose(*steps):
+    """
+    Сворачивает цепочку конвертаций в одну функцию a*x + b.
+    Например, compose(fahrenheit_to_celsius, ("C", "K")) переводит °F в K.
+    Шаги проверяются один раз: каждый следующий начинается в единице,
+    которой закончился предыдущий, все единицы одной величины.
+    Отрицательные значения длины и массы проверяются один раз — на входе:
+    все шаги этих величин линейны с положительным множителем.
+    :param steps: функции из FUNCTION_UNITS, пары единиц (из, в) или AffineConverter
+    :return: AffineConverter
+    """
+    if not steps:
+        raise ValueError("Цепочка конвертаций пуста")
+    units = [_step_units(step) for step in steps]
+    for (_, previous_to), (next_from, _) in zip(units, units[1:]):
+        if previous_to != next_from:
+            raise ValueError(f"Цепочка разорвана: {previous_to} → ? → {next_from}")
+    for from_unit, to_unit in units:
+        _conversion(from_unit, to_unit)  # неизвестные единицы и разные величины
+    # Композиция аффинных преобразований одной величины — это прямое
+    # преобразование первой единицы в последнюю, уже предвычисленное в реестре
+    return AffineConverter(units[0][0], units[-1][1])
@@ -1,8 +1,16 @@
 # new_test_converter.py
 
+import array
+import contextlib
+import csv
+import io
+import os
 import unittest
 from converter import *
 
+import conversion_pipeline
+from conversion_pipeline import convert_csv, parse_column_spec
+
 class TestConverter(unittest.TestCase):
 
     def test_celsius_to_fahrenheit(self):
@@ -43,5 +51,238 @@ class TestConverter(unittest.TestCase):
             miles_to_kilometers(-1)
 
 
+    # --- Пакетная конвертация ---
+
+    def test_batch_matches_scalar(self):
+        values = [0, 1.5, 37, 100, 451]
+        pairs = [
+            (celsius_to_fahrenheit_batch, celsius_to_fahrenheit),
+            (fahrenheit_to_celsius_batch, fahrenheit_to_celsius),
+            (meters_to_kilometers_batch, meters_to_kilometers),
+            (kilograms_to_grams_batch, kilograms_to_grams),
+            (miles_to_kilometers_batch, miles_to_kilometers),
+        ]
+        for batch, scalar in pairs:
+            result = batch(values)
+            self.assertIsInstance(result, array.array)
+            self.assertEqual(list(result), [scalar(v) for v in values])
+
+    def test_batch_accepts_typed_arrays(self):
+        self.assertEqual(list(kilograms_to_grams_batch(array.array("q", [1, 2]))), [1000.0, 2000.0])
+        self.assertEqual(list(meters_to_kilometers_batch(memoryview(array.array("d", [500.0])))), [0.5])
+        self.assertEqual(len(celsius_to_fahrenheit_batch([])), 0)
+
+    def test_batch_reports_all_negative_indices(self):
+        with self.assertRaises(NegativeValueError) as ctx:
+            meters_to_kilometers_batch([10, -1, 5, -3, 0])
+        self.assertEqual(ctx.exception.indices, [1, 3])
+        self.assertIn("1, 3", str(ctx.exception))
+        # Совместимо с проверкой одного значения
+        with self.assertRaises(ValueError):
+            kilograms_to_grams_batch([-5])
+        with self.assertRaises(ValueError):
+            miles_to_kilometers_batch([1, 2, -1])
+        # Температура может быть отрицательной
+        self.assertEqual(list(celsius_to_fahrenheit_batch([-40])), [-40.0])
+
+    def test_batch_numpy(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest("NumPy не установлен")
+        values = np.array([0.0, 100.0, -40.0])
+        result = celsius_to_fahrenheit_batch(values)
+        self.assertIsInstance(result, np.ndarray)
+        self.assertEqual(result.tolist(), [32.0, 212.0, -40.0])
+        with self.assertRaises(NegativeValueError) as ctx:
+            miles_to_kilometers_batch(np.array([1.0, -2.0, -3.0]))
+        self.assertEqual(ctx.exception.indices, [1, 2])
+
+
+    # --- Реестр единиц ---
+
+    def test_convert_matches_functions(self):
+        for value in (0, 1, 37.5, 100, 451):
+            self.assertAlmostEqual(convert(value, "C", "F"), celsius_to_fahrenheit(value), delta=1e-9)
+            self.assertAlmostEqual(convert(value, "F", "C"), fahrenheit_to_celsius(value), delta=1e-9)
+            self.assertAlmostEqual(convert(value, "m", "km"), meters_to_kilometers(value), delta=1e-12)
+            self.assertAlmostEqual(convert(value, "kg", "g"), kilograms_to_grams(value), delta=1e-9)
+            self.assertAlmostEqual(convert(value, "mi", "km"), miles_to_kilometers(value), delta=1e-9)
+
+    def test_convert_chained_units(self):
+        self.assertAlmostEqual(convert(1, "mi", "m"), 1609.34, delta=1e-9)
+        self.assertAlmostEqual(convert(0, "C", "K"), 273.15, delta=1e-9)
+        self.assertAlmostEqual(convert(212, "F", "K"), 373.15, delta=1e-9)
+        self.assertAlmostEqual(convert(1, "lb", "kg"), 0.45359237, delta=1e-12)
+        self.assertEqual(convert(5, "km", "km"), 5)
+        self.assertEqual(convert(-40, "C", "F"), -40)
+
+    def test_convert_errors(self):
+        with self.assertRaises(ValueError):
+            convert(1, "m", "kg")  # разные величины
+        with self.assertRaises(ValueError):
+            convert(1, "parsec", "m")
+        with self.assertRaises(ValueError):
+            convert(-1, "mi", "km")
+        with self.assertRaises(ValueError):
+            convert(-5, "kg", "lb")
+
+    def test_register_unit(self):
+        register_unit("yd", "length", 0.9144)
+        self.addCleanup(unregister_unit, "yd")
+        self.assertAlmostEqual(convert(1, "yd", "ft"), 3, delta=1e-9)
+        self.assertAlmostEqual(convert(3, "ft", "yd"), 1, delta=1e-9)
+        self.assertEqual(UNITS["yd"].dimension, "length")
+        with self.assertRaises(ValueError):
+            register_unit("x", "volume", 1.0)
+
+    def test_register_unit_duplicate(self):
+        # Повторная регистрация не должна молча портить преобразования
+        with self.assertRaises(ValueError):
+            register_unit("m", "length", 2)
+        self.assertEqual(convert(1, "km", "m"), 1000)
+        register_unit("ftx", "length", 0.3048)
+        register_unit("ftx", "length", 0.9144, replace=True)
+        self.assertAlmostEqual(convert(1, "ftx", "ft"), 3, delta=1e-9)
+        unregister_unit("ftx")
+        self.assertNotIn("ftx", UNITS)
+        with self.assertRaises(ValueError):
+            convert(1, "ft", "ftx")
+
+
+    def test_convert_batch(self):
+        self.assertEqual(list(convert_batch([0, 100], "C", "F")), [32.0, 212.0])
+        with self.assertRaises(NegativeValueError) as ctx:
+            convert_batch([1, -1, 2, -2], "km", "mi")
+        self.assertEqual(ctx.exception.indices, [1, 3])
+        with self.assertRaises(ValueError):
+            convert_batch([1], "kg", "m")
+
+
+    # --- Свёрнутые цепочки ---
+
+    def test_compose_chain(self):
+        f_to_k = compose(fahrenheit_to_celsius, ("C", "K"))
+        self.assertAlmostEqual(f_to_k(212), 373.15, delta=1e-9)
+        self.assertAlmostEqual(f_to_k(32), 273.15, delta=1e-9)
+        mi_to_m = compose(miles_to_kilometers, ("km", "m"))
+        self.assertAlmostEqual(mi_to_m(2), 2 * 1609.34, delta=1e-9)
+        for value in (-40, 0, 36.6, 100):
+            chained = fahrenheit_to_celsius(celsius_to_fahrenheit(value))
+            self.assertAlmostEqual(compose(celsius_to_fahrenheit, fahrenheit_to_celsius)(value),
+                                   chained, delta=1e-9)
+        self.assertEqual((mi_to_m.from_unit, mi_to_m.to_unit), ("mi", "m"))
+        self.assertEqual(list(mi_to_m.batch([0, 1])), [0.0, 1609.34])
+
+    def test_compose_nested_and_errors(self):
+        c_to_k = compose(("C", "F"), ("F", "K"))
+        self.assertAlmostEqual(compose(c_to_k, ("K", "F"))(100), 212, delta=1e-9)
+        with self.assertRaises(ValueError):
+            compose(miles_to_kilometers, kilograms_to_grams)  # km → kg: разрыв
+        with self.assertRaises(ValueError):
+            compose(("m", "kg"))
+        with self.assertRaises(ValueError):
+            compose()
+        with self.assertRaises(TypeError):
+            compose(abs)
+        with self.assertRaises(ValueError):
+            compose(meters_to_kilometers, ("km", "mi"))(-1)
+        with self.assertRaises(NegativeValueError):
+            compose(("kg", "lb")).batch([1, -1])
+
+
+class TestConversionPipeline(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, "in.csv")
+        self.destination = os.path.join(self.directory.name, "out.csv")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write_source(self, rows):
+        with open(self.source, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+
+    def read_destination(self):
+        with open(self.destination, newline="", encoding="utf-8") as f:
+            return list(csv.reader(f))
+
+    def test_convert_csv_in_chunks(self):
+        temperatures = [-40, 0, 37, 100, 212]
+        self.write_source([["id", "temp", "dist"]] +
+                          [[str(i), str(t), str(i)] for i, t in enumerate(temperatures)])
+        conversions = [parse_column_spec("temp:C:F"), parse_column_spec("dist:mi:km")]
+        rows = convert_csv(self.source, self.destination, conversions, chunk_size=2, verify=True)
+        self.assertEqual(rows, 5)
+        result = self.read_destination()
+        self.assertEqual(result[0], ["id", "temp", "dist"])
+        self.assertEqual([row[0] for row in result[1:]], ["0", "1", "2", "3", "4"])
+        for row, t in zip(result[1:], temperatures):
+            self.assertAlmostEqual(float(row[1]), celsius_to_fahrenheit(t), delta=1e-9)
+            self.assertAlmostEqual(float(row[2]), miles_to_kilometers(int(row[0])), delta=1e-9)
+
+    def test_negative_rows_reported_across_chunks(self):
+        self.write_source([["dist"], ["1"], ["2"], ["-3"], ["4"], ["-5"]])
+        with self.assertRaises(NegativeValueError) as ctx:
+            convert_csv(self.source, self.destination, [parse_column_spec("dist:m:km")], chunk_size=2)
+        self.assertEqual(ctx.exception.indices, [2])  # первая часть с ошибкой — строки 2–3
+
+    def test_pipeline_errors(self):
+        self.write_source([["temp"], ["abc"]])
+        with self.assertRaises(ValueError):
+            convert_csv(self.source, self.destination, [parse_column_spec("other:C:F")])
+        with self.assertRaises(ValueError):
+            convert_csv(self.source, self.destination, [parse_column_spec("temp:C:F")])
+        with self.assertRaises(ValueError):
+            parse_column_spec("temp:C")
+        with self.assertRaises(ValueError):
+            parse_column_spec("temp:C:kg")
+
+    def test_destination_untouched_on_error(self):
+        # Ошибка в середине файла не оставляет частичного результата
+        self.write_source([["dist"], ["1"], ["2"], ["-3"]])
+        with self.assertRaises(NegativeValueError):
+            convert_csv(self.source, self.destination, [parse_column_spec("dist:m:km")], chunk_size=2)
+        self.assertFalse(os.path.exists(self.destination))
+        with open(self.destination, "w", encoding="utf-8") as f:
+            f.write("old\n")
+        for spec in ("other:m:km", "dist:m:km"):
+            with self.assertRaises(ValueError):
+                convert_csv(self.source, self.destination, [parse_column_spec(spec)], chunk_size=2)
+            self.assertEqual(self.read_destination(), [["old"]])
+        self.assertEqual(sorted(os.listdir(self.directory.name)), ["in.csv", "out.csv"])
+        with contextlib.redirect_stdout(io.StringIO()):
+            code = conversion_pipeline.main([self.source, self.destination, "--column", "dist:m:km"])
+        self.assertEqual(code, 1)
+        self.assertEqual(self.read_destination(), [["old"]])
+
+    def test_main(self):
+        self.write_source([["w"], ["1.5"]])
+        with contextlib.redirect_stdout(io.StringIO()):
+            code = conversion_pipeline.main([self.source, self.destination, "--column", "w:kg:g"])
+        self.assertEqual(code, 0)
+        self.assertEqual(self.read_destination(), [["w"], ["1500.0"]])
+
+    @unittest.skipIf(conversion_pipeline.pa is None, "pyarrow не установлен")
+    def test_parquet_keeps_nulls(self):
+        pa, pq = conversion_pipeline.pa, conversion_pipeline.pq
+        source = os.path.join(self.directory.name, "in.parquet")
+        destination = os.path.join(self.directory.name, "out.parquet")
+        pq.write_table(pa.table({"temp": [0.0, None, 100.0, None], "id": [1, 2, 3, 4]}), source)
+        rows = conversion_pipeline.convert_parquet(
+            source, destination, [parse_column_spec("temp:C:F")], chunk_size=3, verify=True)
+        self.assertEqual(rows, 4)
+        result = pq.read_table(destination)
+        self.assertEqual(result.column("temp").to_pylist(), [32.0, None, 212.0, None])
+        self.assertEqual(result.column("id").to_pylist(), [1, 2, 3, 4])
+
+    def test_verify_chunk_skips_missing(self):
+        conversion = parse_column_spec("temp:C:F")
+        conversion_pipeline.verify_chunk([0.0, float("nan"), None], [32.0, float("nan"), None], conversion)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
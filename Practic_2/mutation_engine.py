@@ -0,0 +1,1017 @@
+# mutation_engine.py
+#
+# Общий движок мутационного тестирования для модулей Practic_2.
+# Мутанты не пишутся вручную: они генерируются переписыванием AST
+# тестируемого модуля (замена арифметических операторов, сравнений,
+# логических связок и числовых констант) и компилируются в память один раз.
+# Модуль и тесты импортируются один раз; в процессе мутанта подменяется
+# только код мутированной функции (__code__), без перезагрузки модулей.
+#
+# Пример:
+#   python mutation_engine.py calculator/calculator.py
+#   python mutation_engine.py array_operations/array_operations.py --tests new_test_array_operations
+#   python mutation_engine.py calculator/calculator.py --function power --workers 4 --timeout 5
+#   python mutation_engine.py calculator/calculator.py --json report.json --junit report.xml
+
+import argparse
+import ast
+import collections
+import contextlib
+import hashlib
+import inspect
+import io
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import sqlite3
+import sys
+import threading
+import time
+import types
+import unittest
+import xml.etree.ElementTree as ET
+
+
+# === Операторы мутаций ===
+
+BINOP_MUTATIONS = {
+    ast.Add: [ast.Sub],
+    ast.Sub: [ast.Add],
+    ast.Mult: [ast.Div],
+    ast.Div: [ast.Mult],
+    ast.FloorDiv: [ast.Div],
+    ast.Mod: [ast.Mult],
+    ast.Pow: [ast.Mult],
+    ast.BitAnd: [ast.BitOr],
+    ast.BitOr: [ast.BitAnd],
+    ast.BitXor: [ast.BitAnd],
+    ast.LShift: [ast.RShift],
+    ast.RShift: [ast.LShift],
+}
+
+COMPARE_MUTATIONS = {
+    ast.Lt: [ast.LtE, ast.Gt],
+    ast.LtE: [ast.Lt, ast.GtE],
+    ast.Gt: [ast.GtE, ast.Lt],
+    ast.GtE: [ast.Gt, ast.LtE],
+    ast.Eq: [ast.NotEq],
+    ast.NotEq: [ast.Eq],
+    ast.Is: [ast.IsNot],
+    ast.IsNot: [ast.Is],
+    ast.In: [ast.NotIn],
+    ast.NotIn: [ast.In],
+}
+
+BOOLOP_MUTATIONS = {
+    ast.And: [ast.Or],
+    ast.Or: [ast.And],
+}
+
+SYMBOLS = {
+    ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/", ast.FloorDiv: "//",
+    ast.Mod: "%", ast.Pow: "**", ast.BitAnd: "&", ast.BitOr: "|", ast.BitXor: "^",
+    ast.LShift: "<<", ast.RShift: ">>",
+    ast.Lt: "<", ast.LtE: "<=", ast.Gt: ">", ast.GtE: ">=", ast.Eq: "==", ast.NotEq: "!=",
+    ast.Is: "is", ast.IsNot: "is not", ast.In: "in", ast.NotIn: "not in",
+    ast.And: "and", ast.Or: "or",
+}
+
+
+# Цель мутационного тестирования: путь к модулю, имя модуля и имя тестового модуля
+MutationTarget = collections.namedtuple("MutationTarget", "path module_name test_module")
+
+# Место мутации в дереве: индекс узла в ast.walk, вид, позиция в Compare, замена и строки узла
+MutationPoint = collections.namedtuple(
+    "MutationPoint", "index kind pos replacement function lineno end_lineno description")
+
+# Один мутант: номер, функция, строки, описание, скомпилированный код всего модуля
+# и хеш исходного текста модуля вместе с местом мутации (ключ кэша результатов)
+Mutant = collections.namedtuple("Mutant", "id function lineno end_lineno description code source_hash")
+
+
+def _constant_replacements(value):
+    """Числовая константа заменяется на value + 1 и (если она не ноль) на 0."""
+    if isinstance(value, bool):
+        return [not value]
+    if isinstance(value, (int, float)):
+        return [value + 1, 0] if value else [value + 1]
+    return []
+
+
+def _function_owners(tree):
+    """
+    Сопоставляет каждому узлу AST имя функции верхнего уровня (или метода класса),
+    в которой он находится. Функции, переопределённые ниже по файлу
+    (как «исправленные версии» в Practic_2), не мутируются — их код недостижим.
+    """
+    definitions = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            definitions.append((node.name, node))
+        elif isinstance(node, ast.ClassDef):
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    definitions.append((f"{node.name}.{item.name}", item))
+
+    last_definition = {name: node for name, node in definitions}
+    owners = {}
+    for name, node in definitions:
+        if last_definition[name] is not node:
+            continue
+        for child in ast.walk(node):
+            owners[id(child)] = name
+    return owners
+
+
+def find_mutation_points(tree, functions=None):
+    """
+    Перечисляет возможные мутации дерева.
+    :return: список MutationPoint, упорядоченный по строкам
+    """
+    owners = _function_owners(tree)
+    points = []
+    for index, node in enumerate(ast.walk(tree)):
+        function = owners.get(id(node))
+        if function is None or (functions and function not in functions):
+            continue
+        lines = (getattr(node, "lineno", None), getattr(node, "end_lineno", None))
+        if isinstance(node, (ast.BinOp, ast.AugAssign)):
+            for new_op in BINOP_MUTATIONS.get(type(node.op), []):
+                desc = f"{SYMBOLS[type(node.op)]} → {SYMBOLS[new_op]}"
+                points.append(MutationPoint(index, "op", None, new_op, function, *lines, desc))
+        elif isinstance(node, ast.BoolOp):
+            for new_op in BOOLOP_MUTATIONS.get(type(node.op), []):
+                desc = f"{SYMBOLS[type(node.op)]} → {SYMBOLS[new_op]}"
+                points.append(MutationPoint(index, "op", None, new_op, function, *lines, desc))
+        elif isinstance(node, ast.Compare):
+            for pos, op in enumerate(node.ops):
+                for new_op in COMPARE_MUTATIONS.get(type(op), []):
+                    desc = f"{SYMBOLS[type(op)]} → {SYMBOLS[new_op]}"
+                    points.append(MutationPoint(index, "compare", pos, new_op, function, *lines, desc))
+        elif isinstance(node, ast.Constant):
+            for new_value in _constant_replacements(node.value):
+                desc = f"{node.value!r} → {new_value!r}"
+                points.append(MutationPoint(index, "const", None, new_value, function, *lines, desc))
+    points.sort(key=lambda point: point.lineno)  # нумерация мутантов — по строкам файла
+    return points
+
+
+def _set_mutation_value(node, point, value):
+    """Записывает значение в мутируемое место узла; возвращает прежнее."""
+    if point.kind == "op":
+        old, node.op = node.op, value
+    elif point.kind == "compare":
+        old, node.ops[point.pos] = node.ops[point.pos], value
+    else:
+        old, node.value = node.value, value
+    return old
+
+
+def _replacement_name(point):
+    return point.replacement.__name__ if point.kind != "const" else repr(point.replacement)
+
+
+def generate_mutants(path, functions=None):
+    """
+    Генерирует и компилирует мутантов модуля.
+    :param path: путь к .py-файлу
+    :param functions: ограничить мутации этими функциями (None — все)
+    :return: список Mutant
+    """
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    tree = ast.parse(source, path)
+    points = find_mutation_points(tree, functions)
+    nodes = list(ast.walk(tree))
+    source_digest = hashlib.sha256(source.encode("utf-8"))
+    mutants = []
+    for number, point in enumerate(points, 1):
+        # Одно дерево на всех мутантов: мутация применяется на месте и
+        # откатывается после компиляции — без повторного разбора исходника
+        node = nodes[point.index]
+        replacement = point.replacement if point.kind == "const" else point.replacement()
+        old = _set_mutation_value(node, point, replacement)
+        try:
+            code = compile(tree, path, "exec")
+        finally:
+            _set_mutation_value(node, point, old)
+        # Исходник и место мутации однозначно задают мутанта — без ast.unparse всего модуля
+        digest = source_digest.copy()
+        digest.update(f"\0{point.index}:{point.kind}:{point.pos}:{_replacement_name(point)}".encode("utf-8"))
+        source_hash = digest.hexdigest()
+        mutants.append(Mutant(number, point.function, point.lineno, point.end_lineno,
+                              point.description, code, source_hash))
+    return mutants
+
+
+_mutants_cache = {}
+
+
+def _cached_mutants(target, functions):
+    """Мутанты компилируются один раз; дочерние процессы (fork) получают их готовыми."""
+    key = (target.path, functions)
+    if key not in _mutants_cache:
+        _mutants_cache[key] = generate_mutants(target.path, functions)
+    return _mutants_cache[key]
+
+
+# === Запуск тестов ===
+
+def _iter_suite(suite):
+    for item in suite:
+        if isinstance(item, unittest.TestSuite):
+            yield from _iter_suite(item)
+        else:
+            yield item
+
+
+def collect_tests(test_module):
+    """
+    Собирает тесты обоих стилей, принятых в Practic_2:
+    методы unittest.TestCase и функции test_* с assert.
+    :return: список (имя теста, вызываемый объект без аргументов)
+    """
+    tests = []
+    for case in _iter_suite(unittest.defaultTestLoader.loadTestsFromModule(test_module)):
+        tests.append((case.id(), case))
+    for name, obj in sorted(vars(test_module).items()):
+        if name.startswith("test_") and inspect.isfunction(obj) and obj.__module__ == test_module.__name__:
+            tests.append((name, obj))
+    return tests
+
+
+class _ThreadStdout:
+    """
+    Замена sys.stdout, перенаправляемая отдельно для каждого потока.
+    Ручная подмена sys.stdout = StringIO() перехватывает вывод всех потоков
+    сразу и ломается, если два потока подменяют и восстанавливают его вперемешку.
+    """
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    def _stream(self):
+        return getattr(self._local, "stream", None) or self._default
+
+    def write(self, text):
+        return self._stream().write(text)
+
+    def flush(self):
+        self._stream().flush()
+
+    def __getattr__(self, name):
+        return getattr(self._stream(), name)
+
+
+_stdout_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def captured_output():
+    """
+    Перехватывает stdout только текущего потока; остальные потоки пишут как обычно.
+    :return: StringIO с перехваченным выводом
+    """
+    with _stdout_lock:
+        if not isinstance(sys.stdout, _ThreadStdout):
+            sys.stdout = _ThreadStdout(sys.stdout)
+        proxy = sys.stdout
+    buffer = io.StringIO()
+    previous = getattr(proxy._local, "stream", None)
+    proxy._local.stream = buffer
+    try:
+        yield buffer
+    finally:
+        proxy._local.stream = previous
+
+
+def run_test(test):
+    """Запускает один тест; возвращает True, если он прошёл."""
+    if isinstance(test, unittest.TestCase):
+        result = unittest.TestResult()
+        test.run(result)
+        return result.wasSuccessful()
+    try:
+        test()
+    except (Exception, SystemExit):
+        return False
+    return True
+
+
+def run_tests(test_module, selected=None):
+    """
+    Запускает тесты до первого падения; возвращает имя упавшего теста или None.
+    :param selected: множество имён тестов, которые нужно запустить (None — все)
+    """
+    with captured_output():
+        for name, test in collect_tests(test_module):
+            if selected is not None and name not in selected:
+                continue
+            if not run_test(test):
+                return name
+    return None
+
+
+# === Покрытие: какие тесты выполняют какие строки модуля ===
+
+# Строки, выполненные при импорте модуля (определения, значения по умолчанию):
+# мутант в них влияет на все тесты
+IMPORT_TIME = "<import>"
+
+
+def _line_tracer(path, lines):
+    """Функция трассировки, собирающая номера выполненных строк файла path."""
+    def trace(frame, event, arg):
+        if frame.f_code.co_filename != path:
+            return None
+
+        def trace_lines(frame, event, arg):
+            if event == "line":
+                lines.add(frame.f_lineno)
+            return trace_lines
+
+        lines.add(frame.f_lineno)
+        return trace_lines
+    return trace
+
+
+@contextlib.contextmanager
+def _traced(path, lines):
+    tracer = _line_tracer(path, lines)
+    sys.settrace(tracer)
+    threading.settrace(tracer)
+    try:
+        yield
+    finally:
+        sys.settrace(None)
+        threading.settrace(None)
+
+
+def measure_coverage(target):
+    """
+    Запускает все тесты на исходном модуле, записывая покрытие строк по каждому тесту.
+    Строки, выполненные в дочерних процессах тестов (пул параллельной
+    сортировки), не учитываются.
+    :return: (имя упавшего теста или None, {имя теста: множество строк})
+    """
+    coverage = {IMPORT_TIME: set()}
+    sys.modules.pop(target.module_name, None)
+    with _traced(target.path, coverage[IMPORT_TIME]):
+        test_module = _install_mutant(target, None)
+    failed = None
+    with captured_output():
+        for name, test in collect_tests(test_module):
+            coverage[name] = set()
+            with _traced(target.path, coverage[name]):
+                passed = run_test(test)
+            if not passed and failed is None:
+                failed = name
+    return failed, coverage
+
+
+def select_tests(coverage, mutant):
+    """
+    Имена тестов, выполняющих строки мутанта; None — нужно запускать все тесты.
+    Пустое множество означает, что мутант не покрыт ни одним тестом.
+    """
+    lines = set(range(mutant.lineno, (mutant.end_lineno or mutant.lineno) + 1))
+    if coverage is None or lines & coverage[IMPORT_TIME]:
+        return None
+    return {name for name, covered in coverage.items() if name != IMPORT_TIME and lines & covered}
+
+
+def _install_mutant(target, mutant):
+    """Подменяет модуль в sys.modules мутантом и заново импортирует тесты."""
+    if mutant is not None:
+        module = types.ModuleType(target.module_name)
+        module.__file__ = target.path
+        module.__mutant__ = mutant.id
+        sys.modules[target.module_name] = module
+        exec(mutant.code, module.__dict__)
+    sys.modules.pop(target.test_module, None)
+    return __import__(target.test_module)
+
+
+# === Подмена функции на месте ===
+
+def mutant_function_code(mutant):
+    """
+    Код мутированной функции из скомпилированного модуля мутанта.
+    Для переопределённых функций берётся последнее определение — как при импорте.
+    """
+    found = None
+    stack = [mutant.code]
+    while stack:
+        code = stack.pop(0)
+        for const in code.co_consts:
+            if not isinstance(const, types.CodeType):
+                continue
+            if const.co_qualname == mutant.function:
+                found = const
+            elif "." in mutant.function and const.co_qualname == mutant.function.split(".")[0]:
+                stack.append(const)  # тело класса, в котором лежит метод
+    return found
+
+
+def resolve_function(module, qualname):
+    """Объект функции по имени "func" или "Class.method" (в том числе свойства)."""
+    obj = module
+    for part in qualname.split("."):
+        obj = vars(obj).get(part) if isinstance(obj, type) else getattr(obj, part, None)
+        if isinstance(obj, property):
+            obj = obj.fget
+        elif isinstance(obj, (staticmethod, classmethod)):
+            obj = obj.__func__
+    return obj if isinstance(obj, types.FunctionType) else None
+
+
+@contextlib.contextmanager
+def hot_swap(function, replacement):
+    """
+    Временно подменяет код функции на месте и восстанавливает его на выходе.
+    Все ссылки на функцию (в том числе импортированные через from ... import *)
+    видят подмену, поэтому ни модуль, ни тесты перезагружать не нужно.
+    :param function: подменяемая функция
+    :param replacement: объект кода или функция (тогда подменяются и значения по умолчанию)
+    """
+    saved = function.__code__, function.__defaults__, function.__kwdefaults__
+    if isinstance(replacement, types.FunctionType):
+        function.__code__ = replacement.__code__
+        function.__defaults__ = replacement.__defaults__
+        function.__kwdefaults__ = replacement.__kwdefaults__
+    else:
+        function.__code__ = replacement
+    try:
+        yield function
+    finally:
+        function.__code__, function.__defaults__, function.__kwdefaults__ = saved
+
+
+def _swap_plan(target, mutant):
+    """
+    (функция, код мутанта), если мутанта можно проверить подменой __code__, иначе None.
+    Мутации в значениях по умолчанию и декораторах меняют не код функции,
+    а замыкания должны совпадать по числу свободных переменных — в этих
+    случаях модуль исполняется заново.
+    """
+    module = _original_module(target)
+    if module is None:
+        return None
+    function = resolve_function(module, mutant.function)
+    code = mutant_function_code(mutant)
+    if function is None or code is None or code == function.__code__:
+        return None
+    if code.co_freevars != function.__code__.co_freevars:
+        return None
+    return function, code
+
+
+def _original_module(target):
+    """Исходный (не мутированный) модуль, если он уже импортирован."""
+    module = sys.modules.get(target.module_name)
+    if module is None or getattr(module, "__mutant__", None) is not None:
+        return None
+    if os.path.abspath(getattr(module, "__file__", "")) != os.path.abspath(target.path):
+        return None
+    return module
+
+
+def _loaded_tests(target):
+    """Тестовый модуль, импортированный на исходном модуле, — без повторного импорта."""
+    test_module = sys.modules.get(target.test_module)
+    if test_module is None or _original_module(target) is None:
+        sys.modules.pop(target.module_name, None)
+        test_module = _install_mutant(target, None)
+    return test_module
+
+
+def run_mutant(target, mutant, coverage=None, swap=True, timings=None):
+    """
+    Проверяет одного мутанта (None — исходный модуль) в текущем процессе.
+    :param coverage: результат measure_coverage; если задан, запускаются
+                     только тесты, выполняющие мутированные строки
+    :param swap: подменять код функции на месте; False — исполнять модуль
+                 мутанта и заново импортировать тесты
+    :param timings: словарь, в который записывается время подготовки мутанта
+                    и загрузки тестов ("load") и время самих тестов ("tests")
+    :return: (статус "killed"/"survived"/"uncovered", имя убившего теста или None)
+    """
+    timings = {} if timings is None else timings
+    timings["load"] = timings["tests"] = 0.0
+    selected = None if mutant is None else select_tests(coverage, mutant)
+    if selected is not None and not selected:
+        return "uncovered", None
+    start = time.perf_counter()
+    try:
+        test_module = _loaded_tests(target) if swap and mutant is not None else None
+        plan = _swap_plan(target, mutant) if test_module is not None else None
+        if plan is None:
+            test_module = _install_mutant(target, mutant)
+    except Exception as e:
+        # Мутант ломает сам модуль или импорт тестов — тоже обнаруженная ошибка
+        return "killed", f"<import: {type(e).__name__}>"
+    finally:
+        timings["load"] = time.perf_counter() - start
+    start = time.perf_counter()
+    if plan is None:
+        failed = run_tests(test_module, selected)
+    else:
+        with hot_swap(*plan):
+            failed = run_tests(test_module, selected)
+    timings["tests"] = time.perf_counter() - start
+    return ("killed", failed) if failed else ("survived", None)
+
+
+def measure_preparation(target, mutants, repeat=5):
+    """
+    Сравнивает подготовку мутанта двумя способами: исполнение модуля с
+    повторным импортом тестов и подмену __code__ на месте.
+    Запускать внутри preloaded(target): sys.modules после замера восстанавливается.
+    :return: (секунд на перезагрузку, секунд на подмену, число подменяемых мутантов)
+             в среднем на одного мутанта
+    """
+    plans = [(mutant, _swap_plan(target, mutant)) for mutant in mutants]
+    plans = [(mutant, plan) for mutant, plan in plans if plan is not None][:repeat]
+    if not plans:
+        return None
+    modules = dict(sys.modules)
+    start = time.perf_counter()
+    for mutant, _ in plans:
+        try:
+            _install_mutant(target, mutant)
+        except Exception:
+            pass
+    reload_time = (time.perf_counter() - start) / len(plans)
+    sys.modules.clear()
+    sys.modules.update(modules)
+
+    start = time.perf_counter()
+    for _, plan in plans:
+        with hot_swap(*plan):
+            pass
+    swap_time = (time.perf_counter() - start) / len(plans)
+    swappable = sum(_swap_plan(target, mutant) is not None for mutant in mutants)
+    return reload_time, swap_time, swappable
+
+
+@contextlib.contextmanager
+def preloaded(target):
+    """
+    Импортирует исходный модуль и тесты в текущем процессе: дочерние процессы
+    (fork) получают их готовыми и подменяют только код мутированной функции.
+    На выходе sys.modules и sys.path восстанавливаются.
+    """
+    modules, path = dict(sys.modules), list(sys.path)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(target.path)))
+    try:
+        sys.modules.pop(target.module_name, None)
+        try:
+            _install_mutant(target, None)
+        except Exception:
+            pass  # дочерние процессы импортируют сами и отчитаются об ошибке
+        yield
+    finally:
+        sys.modules.clear()
+        sys.modules.update(modules)
+        sys.path[:] = path
+
+
+# Тестам мутанта разрешено запускать процессы (пул параллельной сортировки),
+# но не процессы из процессов: мутант вида «parallel or ...» иначе рекурсивно
+# порождает пулы, и таймаут уже не успевает его остановить.
+MAX_PROCESS_DEPTH = 1
+_DEPTH_VARIABLE = "MUTATION_ENGINE_PROCESS_DEPTH"
+
+
+def _limit_nested_processes():
+    original_start = multiprocessing.process.BaseProcess.start
+
+    def start(process):
+        depth = int(os.environ.get(_DEPTH_VARIABLE, "0"))
+        if depth >= MAX_PROCESS_DEPTH:
+            raise RuntimeError("Мутант рекурсивно порождает процессы")
+        os.environ[_DEPTH_VARIABLE] = str(depth + 1)
+        try:
+            return original_start(process)
+        finally:
+            os.environ[_DEPTH_VARIABLE] = str(depth)
+
+    multiprocessing.process.BaseProcess.start = start
+
+
+def _prepare_child(target):
+    """Общая подготовка дочернего процесса мутанта или замера покрытия."""
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()  # по таймауту останавливается вся группа, включая процессы тестов
+    os.environ[_DEPTH_VARIABLE] = "0"
+    _limit_nested_processes()
+    sys.path.insert(0, os.path.dirname(os.path.abspath(target.path)))
+
+
+def _mutant_worker(index, conn, target, functions, coverage, swap):
+    """Выполняется в дочернем процессе: мутант не влияет на остальные."""
+    _prepare_child(target)
+    mutant = None if index is None else _cached_mutants(target, functions)[index]
+    start = time.perf_counter()
+    timings = {}
+    status, test = run_mutant(target, mutant, coverage, swap, timings)
+    conn.send((status, test, time.perf_counter() - start, timings["load"]))
+    conn.close()
+
+
+def _coverage_worker(target, conn):
+    _prepare_child(target)
+    start = time.perf_counter()
+    failed, coverage = measure_coverage(target)
+    conn.send((failed, coverage, time.perf_counter() - start))
+    conn.close()
+
+
+def run_baseline(target):
+    """
+    Прогоняет тесты на исходном модуле в отдельном процессе, записывая покрытие.
+    :return: (имя упавшего теста или None, покрытие, время в секундах)
+    """
+    ctx = multiprocessing.get_context()
+    reader, writer = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_coverage_worker, args=(target, writer))
+    process.start()
+    writer.close()
+    try:
+        result = reader.recv()
+    except EOFError:
+        result = (f"<crash: exit code {process.exitcode}>", None, 0.0)
+    process.join()
+    _kill_group(process)
+    return result
+
+
+def _kill_group(process):
+    """Убивает процессы, оставшиеся в группе мутанта (например, зависший пул)."""
+    if hasattr(os, "killpg"):
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            # Процесс не стал лидером своей группы (или группа уже пуста)
+            process.kill()
+    else:
+        process.terminate()
+
+
+def run_mutants_parallel(target, functions=None, workers=None, timeout=10.0, indices=None,
+                         coverage=None, swap=True):
+    """
+    Запускает мутантов в пуле не более чем из workers процессов.
+    Мутант, не уложившийся в timeout секунд, останавливается (статус "timeout").
+    :param indices: номера мутантов в списке; None в списке означает исходный модуль
+    :param coverage: покрытие из measure_coverage для выбора тестов (None — все тесты)
+    :param swap: импортировать модуль и тесты один раз и подменять в процессах
+                 мутантов только код функции (см. hot_swap)
+    :return: словарь индекс -> (статус, убивший тест, время, время подготовки и загрузки тестов);
+             у остановленных и упавших процессов время загрузки неизвестно (None)
+    """
+    if indices is None:
+        indices = range(len(_cached_mutants(target, functions)))
+    args = (target, functions, coverage, swap)
+    if not swap:
+        return run_processes(_mutant_worker, indices, args, workers, timeout)
+    with preloaded(target):
+        return run_processes(_mutant_worker, indices, args, workers, timeout)
+
+
+def _crashed_mutant(exitcode, elapsed):
+    return "killed", f"<crash: exit code {exitcode}>", elapsed, None
+
+
+def _timed_out_mutant(elapsed):
+    return "timeout", None, elapsed, None
+
+
+def run_processes(worker, indices, args=(), workers=None, timeout=10.0,
+                  crashed=_crashed_mutant, timed_out=_timed_out_mutant):
+    """
+    Запускает worker(index, conn, *args) для каждого индекса в отдельном процессе,
+    не более workers процессов одновременно. Результат процесс отправляет в conn.
+    :param crashed: crashed(exitcode, время) — результат процесса, завершившегося без отчёта
+    :param timed_out: timed_out(время) — результат процесса, остановленного по timeout
+    :return: словарь индекс -> результат
+    """
+    workers = workers or os.cpu_count() or 1
+    ctx = multiprocessing.get_context()
+    pending = collections.deque(indices)
+    # У каждого процесса свой канал: убитый по таймауту процесс
+    # не может оставить занятой общую блокировку, как у multiprocessing.Queue
+    running = {}  # канал -> (индекс, процесс, время запуска)
+    results = {}
+
+    while pending or running:
+        while pending and len(running) < workers:
+            index = pending.popleft()
+            reader, writer = ctx.Pipe(duplex=False)
+            # Не daemon: тестам (например, параллельной сортировке) нужны свои процессы
+            process = ctx.Process(target=worker, args=(index, writer) + tuple(args))
+            process.start()
+            writer.close()
+            running[reader] = (index, process, time.perf_counter())
+
+        for reader in multiprocessing.connection.wait(list(running), timeout=0.05):
+            index, process, started = running.pop(reader)
+            try:
+                results[index] = reader.recv()
+            except EOFError:
+                # Процесс завершился, не отчитавшись (например, переполнение стека)
+                process.join()
+                results[index] = crashed(process.exitcode, time.perf_counter() - started)
+            process.join()
+            _kill_group(process)
+            reader.close()
+
+        now = time.perf_counter()
+        for reader, (index, process, started) in list(running.items()):
+            if now - started > timeout:
+                _kill_group(process)
+                process.join()
+                results[index] = timed_out(now - started)
+                reader.close()
+                del running[reader]
+
+    return results
+
+
+# === Кэш результатов между запусками ===
+
+class ResultCache:
+    """
+    Результаты мутантов в SQLite. Ключ — хеш исходного текста модуля вместе
+    с местом мутации и хеш файла тестов: если не изменились ни модуль,
+    ни тесты, мутант повторно не запускается.
+    Статусы, зависящие от режима запуска («не покрыт» — от выбора тестов
+    по покрытию, «таймаут» — от --timeout), не кэшируются: такие мутанты
+    запускаются заново.
+    """
+
+    UNCACHED_STATUSES = ("uncovered", "timeout")
+
+    def __init__(self, path):
+        self.db = sqlite3.connect(path)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "mutant_hash TEXT, tests_hash TEXT, status TEXT, test TEXT, elapsed REAL, load REAL, "
+            "PRIMARY KEY (mutant_hash, tests_hash))"
+        )
+        columns = {row[1] for row in self.db.execute("PRAGMA table_info(results)")}
+        if "load" not in columns:  # кэш, записанный до появления времени загрузки
+            self.db.execute("ALTER TABLE results ADD COLUMN load REAL")
+
+    def get(self, mutant_hash, tests_hash):
+        row = self.db.execute(
+            "SELECT status, test, elapsed, load FROM results WHERE mutant_hash = ? AND tests_hash = ?",
+            (mutant_hash, tests_hash),
+        ).fetchone()
+        # Строки с такими статусами могли остаться от прежних версий кэша
+        if not row or row[0] in self.UNCACHED_STATUSES:
+            return None
+        return tuple(row)
+
+    def put(self, mutant_hash, tests_hash, result):
+        if result[0] in self.UNCACHED_STATUSES:
+            return
+        self.db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                        (mutant_hash, tests_hash) + tuple(result))
+
+    def close(self):
+        self.db.commit()
+        self.db.close()
+
+
+def hash_test_file(target):
+    """Хеш файла тестового модуля."""
+    directory = os.path.dirname(target.path)
+    with open(os.path.join(directory, target.test_module + ".py"), "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def default_test_module(path):
+    """new_test_<модуль>, если есть, иначе test_<модуль>."""
+    directory = os.path.dirname(os.path.abspath(path))
+    module_name = os.path.splitext(os.path.basename(path))[0]
+    for candidate in (f"new_test_{module_name}", f"test_{module_name}"):
+        if os.path.exists(os.path.join(directory, candidate + ".py")):
+            return candidate
+    raise FileNotFoundError(f"Не найден тестовый модуль для {path}")
+
+
+# === Машиночитаемые отчёты ===
+
+def mutant_records(mutants, results, cached=()):
+    """
+    Результаты мутантов в виде словарей — общая основа JSON- и JUnit-отчётов.
+    :param cached: индексы мутантов, результаты которых взяты из кэша
+    """
+    records = []
+    for index, mutant in enumerate(mutants):
+        status, test, elapsed, load = results[index]
+        records.append({
+            "id": mutant.id,
+            "function": mutant.function,
+            "line": mutant.lineno,
+            "description": mutant.description,
+            "status": status,
+            "killed_by": test,
+            "seconds": elapsed,
+            "load_seconds": load,
+            "cached": index in cached,
+        })
+    return records
+
+
+def summarize(records):
+    """Число мутантов по статусам и доля убитых (таймаут тоже считается убийством)."""
+    summary = {"total": len(records)}
+    for status in ("killed", "timeout", "survived", "uncovered"):
+        summary[status] = sum(record["status"] == status for record in records)
+    detected = summary["killed"] + summary["timeout"]
+    summary["score"] = detected / len(records) if records else None
+    return summary
+
+
+def slowest_mutants(records, count=5):
+    """Мутанты, которые проверялись дольше всего."""
+    return sorted(records, key=lambda record: record["seconds"], reverse=True)[:count]
+
+
+def write_json_report(path, target, records, baseline_seconds=None):
+    report = {
+        "module": target.module_name,
+        "path": target.path,
+        "tests": target.test_module,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "baseline_seconds": baseline_seconds,
+        "summary": summarize(records),
+        "mutants": records,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def write_junit_report(path, target, records):
+    """
+    Отчёт в формате JUnit XML: мутант — тестовый случай.
+    Выживший мутант — failure, не покрытый тестами — skipped.
+    """
+    summary = summarize(records)
+    suite = ET.Element("testsuite", {
+        "name": f"mutation.{target.module_name}",
+        "tests": str(summary["total"]),
+        "failures": str(summary["survived"]),
+        "skipped": str(summary["uncovered"]),
+        "errors": "0",
+        "time": f"{sum(record['seconds'] for record in records):.6f}",
+    })
+    for record in records:
+        case = ET.SubElement(suite, "testcase", {
+            "classname": f"{target.module_name}.{record['function']}",
+            "name": f"#{record['id']} line {record['line']}: {record['description']}",
+            "time": f"{record['seconds']:.6f}",
+        })
+        if record["status"] == "survived":
+            ET.SubElement(case, "failure", {"message": "мутант выжил"})
+        elif record["status"] == "uncovered":
+            ET.SubElement(case, "skipped", {"message": "мутант не покрыт ни одним тестом"})
+        else:
+            killed_by = record["killed_by"] or record["status"]
+            ET.SubElement(case, "system-out").text = f"убит: {killed_by}"
+    tree = ET.ElementTree(suite)
+    ET.indent(tree)
+    tree.write(path, encoding="utf-8", xml_declaration=True)
+
+
+# === Основной запуск ===
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Мутационное тестирование модулей Practic_2")
+    parser.add_argument("target", help="путь к тестируемому модулю, например calculator/calculator.py")
+    parser.add_argument("--tests", default=None, help="имя тестового модуля (по умолчанию new_test_* или test_*)")
+    parser.add_argument("--function", action="append", default=None,
+                        help="мутировать только эту функцию (можно указать несколько раз)")
+    parser.add_argument("--workers", type=int, default=None, help="число процессов (по умолчанию — ядра)")
+    parser.add_argument("--no-coverage", action="store_true",
+                        help="не выбирать тесты по покрытию, запускать все тесты на каждом мутанте")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="лимит времени на мутанта, сек (по умолчанию — 10 × время тестов + 1 с)")
+    parser.add_argument("--cache", default=None,
+                        help="файл кэша результатов (по умолчанию .mutation_cache.sqlite рядом с модулем)")
+    parser.add_argument("--no-cache", action="store_true", help="не читать и не писать кэш")
+    parser.add_argument("--reload", action="store_true",
+                        help="исполнять модуль мутанта и заново импортировать тесты вместо подмены __code__")
+    parser.add_argument("--json", default=None, help="записать отчёт в JSON-файл")
+    parser.add_argument("--junit", default=None, help="записать отчёт в формате JUnit XML")
+    parser.add_argument("--slowest", type=int, default=5, help="сколько самых медленных мутантов показать")
+    args = parser.parse_args(argv)
+
+    module_name = os.path.splitext(os.path.basename(args.target))[0]
+    target = MutationTarget(os.path.abspath(args.target), module_name,
+                            args.tests or default_test_module(args.target))
+    functions = tuple(args.function) if args.function else None
+
+    mutants = _cached_mutants(target, functions)
+    cache = None
+    if not args.no_cache:
+        cache_path = args.cache or os.path.join(os.path.dirname(target.path), ".mutation_cache.sqlite")
+        cache = ResultCache(cache_path)
+    current_tests_hash = hash_test_file(target)
+    results = {}
+    if cache is not None:
+        for index, mutant in enumerate(mutants):
+            cached = cache.get(mutant.source_hash, current_tests_hash)
+            if cached is not None:
+                results[index] = cached
+    from_cache = len(results)
+    pending = [index for index in range(len(mutants)) if index not in results]
+
+    print(f"🧪 Мутационное тестирование {module_name}: {len(mutants)} мутантов, "
+          f"тесты — {target.test_module} (из кэша: {from_cache})\n")
+
+    coverage = baseline_seconds = None
+    if pending:
+        failed, coverage, baseline_seconds = run_baseline(target)
+        if failed:
+            print(f"❌ Тесты {target.test_module} не проходят на исходном коде ({failed}) — "
+                  f"мутационное тестирование бессмысленно.")
+            return 1
+        timeout = args.timeout or 10 * baseline_seconds + 1.0
+        if args.no_coverage:
+            coverage = None
+        if not args.reload:
+            with preloaded(target):
+                preparation = measure_preparation(target, [mutants[index] for index in pending])
+            if preparation:
+                reload_time, swap_time, swappable = preparation
+                print(f"⚡ Подготовка мутанта: перезагрузка {reload_time * 1000:.3f} мс → "
+                      f"подмена __code__ {swap_time * 1000:.3f} мс "
+                      f"(экономия {(reload_time - swap_time) * 1000:.3f} мс на мутанта; "
+                      f"подменой проверяются {swappable} из {len(pending)})\n")
+        fresh = run_mutants_parallel(target, functions, workers=args.workers, timeout=timeout,
+                                     indices=pending, coverage=coverage, swap=not args.reload)
+        results.update(fresh)
+        if cache is not None:
+            for index, result in fresh.items():
+                cache.put(mutants[index].source_hash, current_tests_hash, result)
+    if cache is not None:
+        cache.close()
+
+    icons = {"killed": "❌ убит", "timeout": "⏱️  таймаут", "survived": "✅ выжил",
+             "uncovered": "🕳️  не покрыт"}
+    for index, mutant in enumerate(mutants):
+        status, test, elapsed, _ = results[index]
+        location = f"{mutant.function}:{mutant.lineno}"
+        source = "  [кэш]" if index not in pending else ""
+        print(f"🔁 #{mutant.id:<4} {location:28} {mutant.description:24} "
+              f"{icons[status]:12} {elapsed:6.2f} с" + (f"  ({test})" if test else "") + source)
+    print()
+
+    records = mutant_records(mutants, results, cached=set(range(len(mutants))) - set(pending))
+    summary = summarize(records)
+    total = summary["total"]
+    killed = summary["killed"] + summary["timeout"]
+    print(f"📊 Результаты мутационного тестирования:")
+    print(f"   Убито мутантов: {killed}/{total}")
+    if total:
+        print(f"   Процент убитых: {killed / total * 100:.1f}%")
+    print(f"   Не покрыты ни одним тестом: {summary['uncovered']}")
+    loads = [record["load_seconds"] for record in records if record["load_seconds"] is not None]
+    if loads:
+        print(f"   Подготовка мутанта и загрузка тестов: {sum(loads) / len(loads) * 1000:.3f} мс в среднем")
+    if coverage is not None and total:
+        all_tests = len(coverage) - 1
+        selected = [select_tests(coverage, mutant) for mutant in mutants]
+        average = sum(all_tests if names is None else len(names) for names in selected) / total
+        print(f"   Тестов на мутанта (по покрытию): {average:.1f} из {all_tests}")
+
+    if killed == total:
+        print("🎉 Отлично! Все мутанты убиты — тесты надёжны.")
+    elif killed == 0:
+        print("💀 Плохо! Ни один мутант не был обнаружен — тесты бесполезны.")
+    else:
+        print("⚠️  Некоторые мутанты выжили — нужно улучшить тесты.")
+
+    if args.slowest > 0 and records:
+        print(f"\n🐢 Самые медленные мутанты:")
+        for record in slowest_mutants(records, args.slowest):
+            location = f"{record['function']}:{record['line']}"
+            print(f"   #{record['id']:<4} {location:28} {record['description']:24} "
+                  f"{record['seconds']:6.2f} с")
+    if args.json:
+        write_json_report(args.json, target, records, baseline_seconds)
+        print(f"\n📄 JSON-отчёт записан в {args.json}")
+    if args.junit:
+        write_junit_report(args.junit, target, records)
+        print(f"\n📄 JUnit-отчёт записан в {args.junit}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
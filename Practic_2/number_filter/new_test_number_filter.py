@@ -1,6 +1,7 @@
 # new_test_number_filter.py
 
 from number_filter import *
+from number_filter import _is_prime_trial
 
 def test_is_even():
     assert is_even(4) is True
@@ -74,10 +75,95 @@ def test_filter_odd_numbers():
     print("✅ test_filter_odd_numbers passed")
 
 
+def test_is_prime_matches_trial_division():
+    for n in range(-10, 20000):
+        assert is_prime(n) == _is_prime_trial(n), n
+    assert is_prime(7.0) is True  # нецелые — прежней проверкой делением
+    print("✅ test_is_prime_matches_trial_division passed")
+
+def test_prime_index_segments():
+    index = PrimeIndex(5000, segment_odds=64)
+    primes = [n for n in range(5000) if n in index]
+    assert primes == [n for n in range(5000) if _is_prime_trial(n)]
+    assert len(index.segments) == 5000 // 2 // 64 + 1  # каждый сегмент построен один раз
+    assert small_primes(30) == [3, 5, 7, 11, 13, 17, 19, 23, 29]
+    assert pack_bits(bytes([1, 0, 1, 0, 0, 0, 0, 1])) == bytes([0b10000101])
+    try:
+        5001 in index
+    except ValueError:
+        pass
+    else:
+        assert False, "Expected ValueError"
+    print("✅ test_prime_index_segments passed")
+
+def test_is_prime_above_sieve_limit():
+    assert miller_rabin(2 ** 61 - 1) is True  # простое Мерсенна
+    assert miller_rabin(2 ** 61 + 1) is False
+    assert miller_rabin(3215031751) is False  # сильное псевдопростое по основаниям 2, 3, 5, 7
+    assert miller_rabin(1_000_000_007) is True
+    set_sieve_limit(100)
+    try:
+        assert [n for n in range(90, 130) if is_prime(n)] == [97, 101, 103, 107, 109, 113, 127]
+    finally:
+        set_sieve_limit(SIEVE_LIMIT)
+    print("✅ test_is_prime_above_sieve_limit passed")
+
+def test_is_prime_integral_types():
+    class Index:
+        def __init__(self, value):
+            self.value = value
+
+        def __index__(self):
+            return self.value
+
+    lo = 10 ** 12
+    expected = [miller_rabin(n) for n in range(lo, lo + 50)]
+    assert [is_prime(Index(n)) for n in range(lo, lo + 50)] == expected
+    assert is_prime(7.0) is True  # нецелые типы — по-прежнему пробным делением
+    try:
+        import numpy as np
+    except ImportError:
+        print("⏭️  test_is_prime_integral_types: numpy.int64 skipped, NumPy не установлен")
+    else:
+        values = np.arange(lo, lo + 50, dtype=np.int64)
+        assert [is_prime(n) for n in values] == expected
+        assert is_prime(np.int64(97)) is True and is_prime(np.uint8(91)) is False
+    print("✅ test_is_prime_integral_types passed")
+
+def test_primes_in_range():
+    expected = [n for n in range(3000) if _is_prime_trial(n)]
+    assert list(primes_in_range(0, 3000)) == expected
+    # Маленькие сегменты: границы сегментов не теряют и не дублируют простые
+    for lo, hi in [(0, 3000), (2, 3), (3, 4), (1000, 1100), (97, 98), (10, 10), (0, 2)]:
+        result = list(primes_in_range(lo, hi, segment_odds=16))
+        assert result == [p for p in expected if lo <= p < hi], (lo, hi)
+    print("✅ test_primes_in_range passed")
+
+def test_primes_in_range_chunked():
+    chunks = list(primes_in_range(0, 1000, chunked=True, segment_odds=64))
+    assert len(chunks) > 1
+    assert [int(p) for chunk in chunks for p in chunk] == list(primes_in_range(0, 1000))
+    print("✅ test_primes_in_range_chunked passed")
+
+def test_primes_in_huge_range():
+    lo = 10 ** 12
+    primes = list(primes_in_range(lo, lo + 3000))
+    assert primes == [n for n in range(lo, lo + 3000) if miller_rabin(n)]
+    assert primes[0] == 1_000_000_000_039
+    print("✅ test_primes_in_huge_range passed")
+
+
 if __name__ == "__main__":
     test_is_even()
     test_is_odd()
     test_is_prime()
     test_is_fibonacci()
     test_filter_even_numbers()
-    test_filter_odd_numbers()
\ No newline at end of file
+    test_filter_odd_numbers()
+    test_is_prime_matches_trial_division()
+    test_prime_index_segments()
+    test_is_prime_above_sieve_limit()
+    test_is_prime_integral_types()
+    test_primes_in_range()
+    test_primes_in_range_chunked()
+    test_primes_in_huge_range()
\ No newline at end of file
@@ -1,5 +1,15 @@
 # number_filter.py
 
+import array
+import itertools
+import math
+import operator
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен: без него биты упаковываются на чистом Python
+    np = None
+
 def is_even(n):
     """
     Checks if a number is even.
@@ -21,9 +31,25 @@ def is_odd(n):
 def is_prime(n):
     """
     Checks if a number is prime.
+    Integers below the sieve bound are looked up in a lazily built, cached
+    bit-packed sieve (O(1)); larger ones use deterministic Miller–Rabin (O(log n)).
+    Any integral type (e.g. numpy.int64) is handled like int.
     :param n: int
     :return: bool
     """
+    try:
+        # Целые любого типа (numpy.int64 из массивов и т.п.) приводятся к int;
+        # пробное деление остаётся только для нецелых типов
+        n = operator.index(n)
+    except TypeError:
+        return _is_prime_trial(n)
+    if n < _prime_index.limit:
+        return n in _prime_index
+    return miller_rabin(n)
+
+
+def _is_prime_trial(n):
+    """Trial division up to √n: the reference check, also used for non-int input."""
     if n < 2:
         return False
     for i in range(2, int(n ** 0.5) + 1):
@@ -88,3 +114,200 @@ def is_fibonacci(n):
         return root * root == x
 
     return is_perfect_square(5 * n * n + 4) or is_perfect_square(5 * n * n - 4)
+
+
+# === Prime index: segmented bit-packed sieve + Miller–Rabin ===
+
+SIEVE_LIMIT = 10_000_000
+
+# Odd numbers per sieve segment (a multiple of 8, so segments pack into whole bytes)
+SEGMENT_ODDS = 1 << 18
+
+
+def small_primes(limit):
+    """
+    Odd primes below limit (simple Sieve of Eratosthenes): the base primes for segments.
+    :param limit: int
+    :return: list of int
+    """
+    if limit <= 3:
+        return []
+    flags = bytearray([1]) * (limit // 2)  # flags[i] — число 2 * i + 1
+    flags[0] = 0
+    for i in range(1, (math.isqrt(limit - 1) - 1) // 2 + 1):
+        if flags[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            flags[start::p] = bytes(len(range(start, len(flags), p)))
+    return [2 * i + 1 for i, flag in enumerate(flags) if flag]
+
+
+def sieve_odd_segment(start, count, base_primes):
+    """
+    Sieves the odd numbers start, start + 2, ..., start + 2 * (count - 1).
+    :param start: odd int
+    :param count: number of odd numbers in the segment
+    :param base_primes: odd primes up to at least √(start + 2 * count)
+    :return: bytearray of flags, 1 for a prime
+    """
+    flags = bytearray([1]) * count
+    end = start + 2 * count
+    for p in base_primes:
+        square = p * p
+        if square >= end:
+            break
+        first = max(square, (start + p - 1) // p * p)
+        if first % 2 == 0:
+            first += p
+        index = (first - start) // 2
+        flags[index::p] = bytes(len(range(index, count, p)))
+    if start == 1 and count:
+        flags[0] = 0  # 1 не простое
+    return flags
+
+
+_PACK_MAGIC = 0x0102040810204080
+
+
+def pack_bits(flags):
+    """
+    Packs 0/1 bytes into bits, eight flags per byte (bit k of byte i is flags[8 * i + k]).
+    :param flags: bytes-like object whose length is a multiple of 8
+    :return: bytes
+    """
+    if np is not None:
+        return np.packbits(np.frombuffer(flags, dtype=np.uint8), bitorder="little").tobytes()
+    # Eight 0/1 bytes read as one little-endian word: the multiplication gathers
+    # byte k into bit k of the top byte (no carries, since every term lands on its own bit)
+    words = memoryview(bytes(flags)).cast("Q") if len(flags) else []
+    return bytes((word * _PACK_MAGIC & 0xFFFFFFFFFFFFFFFF) >> 56 for word in words)
+
+
+class PrimeIndex:
+    """
+    Primality lookup for 0 <= n < limit. Only odd numbers are stored, one bit
+    each, in segments of SEGMENT_ODDS numbers that are sieved on first use
+    and then cached: limit = 10⁷ takes at most 625 KB.
+    """
+
+    def __init__(self, limit=SIEVE_LIMIT, segment_odds=SEGMENT_ODDS):
+        if segment_odds % 8:
+            raise ValueError("segment_odds must be a multiple of 8.")
+        self.limit = limit
+        self.segment_odds = segment_odds
+        self.segments = {}
+        self._base_primes = None
+
+    def _segment(self, number):
+        bits = self.segments.get(number)
+        if bits is None:
+            if self._base_primes is None:
+                self._base_primes = small_primes(math.isqrt(self.limit) + 1)
+            start = 2 * number * self.segment_odds + 1
+            bits = pack_bits(sieve_odd_segment(start, self.segment_odds, self._base_primes))
+            self.segments[number] = bits
+        return bits
+
+    def __contains__(self, n):
+        if n < 3:
+            return n == 2
+        if not n & 1:
+            return False
+        if n >= self.limit:
+            raise ValueError(f"{n} is outside the index (limit {self.limit}).")
+        odd = n >> 1
+        bits = self._segment(odd // self.segment_odds)
+        offset = odd % self.segment_odds
+        return bool(bits[offset >> 3] >> (offset & 7) & 1)
+
+
+_prime_index = PrimeIndex()
+
+
+def set_sieve_limit(limit):
+    """
+    Changes the bound below which is_prime uses the sieve; the cache is dropped.
+    :param limit: int
+    """
+    global _prime_index
+    _prime_index = PrimeIndex(limit)
+
+
+# Miller–Rabin with the first 13 primes as bases is deterministic for n < 3.3 * 10**24
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+MILLER_RABIN_DETERMINISTIC_LIMIT = 3_317_044_064_679_887_385_961_981
+
+
+def miller_rabin(n):
+    """
+    Miller–Rabin primality test.
+    Deterministic below MILLER_RABIN_DETERMINISTIC_LIMIT; above it the same
+    bases give a strong probable-prime test.
+    :param n: int
+    :return: bool
+    """
+    if n < 2:
+        return False
+    for p in _MR_BASES:
+        if n % p == 0:
+            return n == p
+    d, s = n - 1, 0
+    while not d & 1:
+        d >>= 1
+        s += 1
+    for a in _MR_BASES:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+# === Streaming primes in a range ===
+
+# Odd numbers per segment of primes_in_range: a 1 MB bytearray at a time
+RANGE_SEGMENT_ODDS = 1 << 20
+
+
+def _segment_primes(start, flags):
+    """Primes of a sieved segment as an array: numpy.ndarray if available, else array.array("q")."""
+    if np is not None:
+        return np.flatnonzero(np.frombuffer(flags, dtype=np.uint8)) * 2 + start
+    return array.array("q", itertools.compress(itertools.count(start, 2), flags))
+
+
+def primes_in_range(lo, hi, chunked=False, segment_odds=RANGE_SEGMENT_ODDS):
+    """
+    Generates every prime p with lo <= p < hi (half-open, like range) with a
+    segmented Sieve of Eratosthenes. Memory is bounded by one segment plus the
+    base primes up to √hi, whatever the width of the range:
+    [10**12, 10**12 + 10**9) needs a 1 MB segment and about 78 500 base primes.
+    :param lo: int
+    :param hi: int
+    :param chunked: yield one array of primes per segment (numpy.ndarray, or
+                    array.array("q") without NumPy) instead of single ints
+    :param segment_odds: odd numbers sieved per segment
+    :return: generator of int, or of arrays when chunked
+    """
+    if hi <= 2 or hi <= lo:
+        return
+    if lo <= 2:
+        if chunked:
+            yield np.array([2]) if np is not None else array.array("q", [2])
+        else:
+            yield 2
+    start = max(lo, 3) | 1  # первое нечётное >= max(lo, 3)
+    base_primes = small_primes(math.isqrt(hi - 1) + 1)
+    while start < hi:
+        count = min(segment_odds, (hi - start + 1) // 2)
+        flags = sieve_odd_segment(start, count, base_primes)
+        if chunked:
+            yield _segment_primes(start, flags)
+        else:
+            yield from itertools.compress(range(start, start + 2 * count, 2), flags)
+        start += 2 * count
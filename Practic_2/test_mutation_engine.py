@@ -0,0 +1,224 @@
+# test_mutation_engine.py
+
+import ast
+import contextlib
+import os
+import sys
+import unittest
+
+from mutation_engine import *
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CALCULATOR = os.path.join(HERE, "calculator", "calculator.py")
+
+SOURCE = '''
+def f(a, b):
+    return a + b
+
+def g(a):
+    if a < 2 and a != 0:
+        return 10
+    return a
+
+def g(a):
+    return a * 3
+'''
+
+
+@contextlib.contextmanager
+def isolated_modules(directory):
+    """Мутанты подменяют модули в sys.modules — после теста возвращаем всё как было."""
+    modules, path = dict(sys.modules), list(sys.path)
+    sys.path.insert(0, directory)
+    try:
+        yield
+    finally:
+        sys.modules.clear()
+        sys.modules.update(modules)
+        sys.path[:] = path
+
+
+class TestMutationEngine(unittest.TestCase):
+
+    def test_find_mutation_points(self):
+        points = find_mutation_points(ast.parse(SOURCE))
+        descriptions = [(point.function, point.description) for point in points]
+        self.assertIn(("f", "+ → -"), descriptions)
+        self.assertIn(("g", "* → /"), descriptions)
+        self.assertIn(("g", "3 → 4"), descriptions)
+        self.assertIn(("g", "3 → 0"), descriptions)
+        # Первая g переопределена ниже — её код недостижим и не мутируется
+        self.assertNotIn(("g", "< → <="), descriptions)
+        self.assertNotIn(("g", "and → or"), descriptions)
+
+    def test_find_mutation_points_function_filter(self):
+        points = find_mutation_points(ast.parse(SOURCE), functions=("f",))
+        self.assertEqual({point.function for point in points}, {"f"})
+
+    def test_generate_mutants_compiles_each_once(self):
+        mutants = generate_mutants(CALCULATOR, functions=("add",))
+        self.assertEqual(len(mutants), 1)
+        namespace = {}
+        exec(mutants[0].code, namespace)
+        self.assertEqual(namespace["add"](5, 3), 2)
+        self.assertEqual(mutants[0].description, "+ → -")
+
+    def test_collect_tests_both_styles(self):
+        import types
+        module = types.ModuleType("fake_tests")
+        exec(
+            "import unittest\n"
+            "def test_plain():\n    assert True\n"
+            "class T(unittest.TestCase):\n    def test_case(self):\n        pass\n",
+            module.__dict__,
+        )
+        names = [name for name, _ in collect_tests(module)]
+        self.assertEqual(len(names), 2)
+        self.assertIn("test_plain", names)
+
+    def test_coverage_guided_selection(self):
+        target = MutationTarget(CALCULATOR, "calculator", "new_test_calculator")
+        mutants = generate_mutants(CALCULATOR, ("add", "power"))
+        with isolated_modules(os.path.dirname(CALCULATOR)):
+            failed, coverage = measure_coverage(target)
+            self.assertIsNone(failed)
+            self.assertIn("test_add", select_tests(coverage, mutants[0]))
+            self.assertNotIn("test_power", select_tests(coverage, mutants[0]))
+            self.assertIn("test_power", select_tests(coverage, mutants[-1]))
+            self.assertNotIn("test_add", select_tests(coverage, mutants[-1]))
+            self.assertEqual(run_mutant(target, mutants[0], coverage), ("killed", "test_add"))
+        self.assertIsNone(select_tests(None, mutants[0]))
+
+    def test_uncovered_mutant(self):
+        target = MutationTarget(CALCULATOR, "calculator", "new_test_calculator")
+        mutant = generate_mutants(CALCULATOR, ("add",))[0]
+        coverage = {IMPORT_TIME: set(), "test_subtract": {20}}
+        self.assertEqual(run_mutant(target, mutant, coverage), ("uncovered", None))
+
+    def test_hot_swap_restores_code(self):
+        def f(a, b=1):
+            return a + b
+
+        def g(a, b=10):
+            return a - b
+
+        alias = f
+        with hot_swap(f, g):
+            self.assertEqual(alias(5), -5)
+        self.assertEqual(f(5), 6)
+        with self.assertRaises(ZeroDivisionError):
+            with hot_swap(f, g.__code__):
+                self.assertEqual(f(5), 4)
+                1 / 0
+        self.assertEqual(f(5), 6)
+
+    def test_mutant_function_code(self):
+        mutant = generate_mutants(CALCULATOR, ("add",))[0]
+        code = mutant_function_code(mutant)
+        self.assertEqual(code.co_name, "add")
+        namespace = {}
+        exec(mutant.code, namespace)
+        self.assertEqual(code, namespace["add"].__code__)
+
+    def test_run_mutant_swap_matches_reload(self):
+        target = MutationTarget(CALCULATOR, "calculator", "new_test_calculator")
+        mutants = generate_mutants(CALCULATOR, ("add", "power"))
+        with isolated_modules(os.path.dirname(CALCULATOR)):
+            test_module = __import__(target.test_module)
+            module = sys.modules[target.module_name]
+            add = module.add
+            swapped = [run_mutant(target, mutant) for mutant in mutants]
+            # Модуль и тесты не импортировались заново, код функции восстановлен
+            self.assertIs(sys.modules[target.test_module], test_module)
+            self.assertIs(module.add, add)
+            self.assertEqual(add(2, 3), 5)
+            reloaded = [run_mutant(target, mutant, swap=False) for mutant in mutants]
+        self.assertEqual(swapped, reloaded)
+
+    def test_result_cache(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache.sqlite")
+            cache = ResultCache(path)
+            self.assertIsNone(cache.get("m1", "t1"))
+            cache.put("m1", "t1", ("killed", "test_add", 0.5, 0.1))
+            cache.close()
+            cache = ResultCache(path)
+            self.assertEqual(cache.get("m1", "t1"), ("killed", "test_add", 0.5, 0.1))
+            self.assertIsNone(cache.get("m1", "t2"))
+            # «Не покрыт» и «таймаут» зависят от режима запуска и не кэшируются
+            cache.put("m2", "t1", ("uncovered", None, 0.0, None))
+            cache.put("m3", "t1", ("timeout", None, 10.0, None))
+            self.assertIsNone(cache.get("m2", "t1"))
+            self.assertIsNone(cache.get("m3", "t1"))
+            cache.close()
+
+    def test_captured_output_per_thread(self):
+        import threading
+        outputs = {}
+        barrier = threading.Barrier(4)
+
+        def worker(number):
+            with captured_output() as output:
+                barrier.wait()
+                for _ in range(100):
+                    print(number)
+            outputs[number] = output.getvalue()
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for number in range(4):
+            self.assertEqual(outputs[number], f"{number}\n" * 100)
+
+    def test_reports(self):
+        import json
+        import tempfile
+        import xml.etree.ElementTree as ET
+        target = MutationTarget(CALCULATOR, "calculator", "new_test_calculator")
+        mutants = generate_mutants(CALCULATOR, ("add", "power"))[:3]
+        results = {0: ("killed", "test_add", 0.2, 0.01),
+                   1: ("survived", None, 0.5, 0.02),
+                   2: ("timeout", None, 3.0, None)}
+        records = mutant_records(mutants, results, cached={1})
+        self.assertEqual(summarize(records)["survived"], 1)
+        self.assertAlmostEqual(summarize(records)["score"], 2 / 3)
+        self.assertEqual([record["id"] for record in slowest_mutants(records, 2)],
+                         [mutants[2].id, mutants[1].id])
+        with tempfile.TemporaryDirectory() as directory:
+            json_path = os.path.join(directory, "report.json")
+            junit_path = os.path.join(directory, "report.xml")
+            write_json_report(json_path, target, records, baseline_seconds=0.1)
+            write_junit_report(junit_path, target, records)
+            with open(json_path, encoding="utf-8") as f:
+                report = json.load(f)
+            suite = ET.parse(junit_path).getroot()
+        self.assertEqual(report["mutants"][0]["killed_by"], "test_add")
+        self.assertTrue(report["mutants"][1]["cached"])
+        self.assertEqual(suite.get("failures"), "1")
+        self.assertEqual(len(suite.findall("testcase")), 3)
+        self.assertEqual(len(suite.findall("testcase/failure")), 1)
+
+    def test_mutant_hashes(self):
+        mutants = generate_mutants(CALCULATOR)
+        hashes = [mutant.source_hash for mutant in mutants]
+        self.assertEqual(len(set(hashes)), len(hashes))
+        self.assertEqual(hashes, [mutant.source_hash for mutant in generate_mutants(CALCULATOR)])
+        target = MutationTarget(CALCULATOR, "calculator", "new_test_calculator")
+        self.assertEqual(len(hash_test_file(target)), 64)
+
+    def test_run_mutants_parallel(self):
+        target = MutationTarget(CALCULATOR, "calculator", "new_test_calculator")
+        results = run_mutants_parallel(target, ("add", "divide"), workers=2, timeout=30)
+        mutants = generate_mutants(CALCULATOR, ("add", "divide"))
+        self.assertEqual(len(results), len(mutants))
+        self.assertEqual(results[0][:2], ("killed", "test_add"))
+        self.assertGreaterEqual(results[0][3], 0.0)
+        statuses = {status for status, *_ in results.values()}
+        self.assertLessEqual(statuses, {"killed", "survived"})
+
+
+if __name__ == '__main__':
+    unittest.main()